@@ -1,11 +1,13 @@
+import asyncio
 import configparser
 import pandas as pd
 import numpy as np
 import datetime
 import time
-import json
-import re
 import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 # Import necessary modules
@@ -14,16 +16,54 @@ import MetaTrader5 as mt5
 from src.data_collector import MT5DataCollector, EconomicCalendarCollector
 from src.ufo_calculator import UfoCalculator
 from src.llm.llm_client import LLMClient
+from src.llm.json_utils import parse_llm_json
 from src.agents.trader_agent import TraderAgent
 from src.agents.risk_manager_agent import RiskManagerAgent
 from src.agents.data_analyst_agent import DataAnalystAgent
 from src.agents.market_researcher_agent import MarketResearcherAgent
 from src.agents.fund_manager_agent import FundManagerAgent
 from src.trade_executor import TradeExecutor
+from src.closed_trades import ClosedTradeStore, fmt_signed, fmt_unsigned
 from src.ufo_trading_engine import UFOTradingEngine
 from src.simulation_ufo_engine import SimulationUFOTradingEngine
 from src.portfolio_manager import PortfolioManager
 from src.dynamic_reinforcement_engine import DynamicReinforcementEngine
+from src._ufo_jit import detect_strength_changes
+from src._stats_jit import summary_stats
+
+# Flat one-pip spread estimate used for every simulated quote
+_SIM_SPREAD = 0.0001
+
+# Reference prices used when a symbol has no historical bar at the simulated time
+_FALLBACK_PRICES = {
+    'EURUSD-ECN': 1.0850, 'GBPUSD-ECN': 1.2650, 'USDJPY-ECN': 143.50,
+    'AUDUSD-ECN': 0.6720, 'USDCAD-ECN': 1.3580, 'NZDUSD-ECN': 0.6250,
+    'EURJPY-ECN': 155.20, 'GBPJPY-ECN': 180.50, 'AUDJPY-ECN': 96.30,
+    'USDCHF-ECN': 0.9120, 'EURCHF-ECN': 0.9880, 'GBPCHF-ECN': 1.1520,
+    'AUDCAD-ECN': 0.9080, 'NZDJPY-ECN': 89.60, 'CADCHF-ECN': 0.6730,
+    'CHFJPY-ECN': 157.20, 'AUDNZD-ECN': 1.0750, 'EURGBP-ECN': 0.8590,
+    'GBPCAD-ECN': 1.7180, 'XAUUSD-ECN': 1850.00, 'GBPAUD-ECN': 1.8820
+}
+
+@lru_cache(maxsize=256)
+def _parse_pair(symbol):
+    """(base, quote) currencies of a broker symbol such as 'EURUSD-ECN'; (None, None) if too short."""
+    clean = symbol.replace('-ECN', '').replace('/', '')
+    return (clean[:3], clean[3:6]) if len(clean) >= 6 else (None, None)
+
+@lru_cache(maxsize=256)
+def _pip_value_multiplier(symbol):
+    """Pip value multiplier for a symbol: 1000 for the JPY crosses, 10000 otherwise."""
+    symbol_clean = symbol.replace('-ECN', '').upper()
+    
+    # JPY pairs use 1000 multiplier (pip = 0.01)
+    jpy_pairs = ('USDJPY', 'EURJPY', 'GBPJPY', 'AUDJPY', 'NZDJPY', 'CHFJPY', 'CADJPY')
+    if any(jpy_pair in symbol_clean for jpy_pair in jpy_pairs):
+        return 1000
+    
+    # Most other forex pairs use 10000 multiplier (pip = 0.0001)
+    # Reduced from 100000 to make P&L more realistic
+    return 10000
 
 class FullDayTradingSimulation:
     def __init__(self, simulation_date=datetime.datetime(2025, 7, 30)):
@@ -37,9 +77,14 @@ class FullDayTradingSimulation:
         self.cycle_count = 0
         self.open_positions = []  # Track simulated positions
         self.closed_trades = []   # Track completed trades
+        self._closed = ClosedTradeStore()  # Columnar closed-trade P&L and running totals
         
         # Continuous monitoring variables
         self.last_position_update = None
+        self._last_monitoring_time = None  # Simulated time of the last monitoring pass
+        # Position market data per simulated second (int epoch key), oldest evicted first
+        self._market_data_cache = OrderedDict()
+        self._market_data_cache_size = 10
         self.position_update_frequency_minutes = 5  # Update positions every 5 minutes
         self.continuous_monitoring_enabled = True
         self.portfolio_history = []  # Track portfolio value over time
@@ -105,7 +150,9 @@ class FullDayTradingSimulation:
         
         # Initialize agents
         symbols_list = self.config['trading']['symbols'].split(',')
-        self.data_analyst = DataAnalystAgent("DataAnalyst", self.mt5_collector)
+        self.data_analyst = DataAnalystAgent(
+            "DataAnalyst", self.mt5_collector, cache_dir=self.config['mt5'].get('bar_cache_dir', '.cache/mt5')
+        )
         self.market_researcher = MarketResearcherAgent("MarketResearcher", self.llm_client)
         self.trader = TraderAgent("Trader", self.llm_client, self.mt5_collector, symbols=symbols_list)
         self.risk_manager = RiskManagerAgent("RiskManager", self.llm_client, self.mt5_collector, self.config)
@@ -151,17 +198,8 @@ class FullDayTradingSimulation:
             return None
     
     def get_pip_value_multiplier(self, symbol):
-        """Get correct pip value multiplier for different currency pairs"""
-        symbol_clean = symbol.replace('-ECN', '').upper()
-        
-        # JPY pairs use 1000 multiplier (pip = 0.01)
-        jpy_pairs = ['USDJPY', 'EURJPY', 'GBPJPY', 'AUDJPY', 'NZDJPY', 'CHFJPY', 'CADJPY']
-        if any(jpy_pair in symbol_clean for jpy_pair in jpy_pairs):
-            return 1000
-        
-        # Most other forex pairs use 10000 multiplier (pip = 0.0001)
-        # Reduced from 100000 to make P&L more realistic
-        return 10000
+        """Get correct pip value multiplier for different currency pairs (classified once per symbol)"""
+        return _pip_value_multiplier(symbol)
     
     def update_portfolio_value(self, current_time=None, force_update=False):
         """Update portfolio value based on open positions P&L using real historical prices"""
@@ -174,45 +212,46 @@ class FullDayTradingSimulation:
         total_unrealized_pnl = 0.0
         position_updates = []
         
-        # Calculate P&L for all open positions using real market data
-        for position in self.open_positions:
+        # Calculate P&L for all open positions at once over column arrays
+        positions = self.open_positions
+        if positions:
+            symbols = [position['symbol'] for position in positions]
+            entry_prices = np.array([position['entry_price'] for position in positions], dtype=np.float64)
             if current_time:
-                # Get real historical price for the current simulation time
-                current_price = self.get_historical_price_for_time(position['symbol'], current_time)
-                if current_price is None:
-                    # Use entry price if no historical data available
-                    current_price = position['entry_price']
+                # Get real historical prices for the current simulation time, once per symbol;
+                # fall back to the entry price if no historical data is available
+                prices = {symbol: self.get_historical_price_for_time(symbol, current_time) for symbol in dict.fromkeys(symbols)}
+                current_prices = np.array(
+                    [prices[symbol] if prices[symbol] is not None else entry for symbol, entry in zip(symbols, entry_prices)],
+                    dtype=np.float64
+                )
             else:
                 # Use entry price as current price
-                current_price = position['entry_price']
-            
-            # Get correct pip value multiplier
-            pip_multiplier = self.get_pip_value_multiplier(position['symbol'])
-            
-            # Calculate P&L based on direction with correct pip values
-            price_diff = current_price - position['entry_price']
-            if position['direction'] == 'SELL':
-                price_diff = -price_diff
-            
-            # Calculate P&L: price_difference * volume * pip_multiplier
-            pnl = price_diff * position['volume'] * pip_multiplier
-            
-            # Track price movement since last update
-            previous_price = position.get('current_price', position['entry_price'])
-            price_change = current_price - previous_price
-            
-            position['current_price'] = current_price
-            position['pnl'] = pnl
-            position['last_update'] = current_time
-            total_unrealized_pnl += pnl
-            
-            # Track significant price movements
-            if abs(price_change) > 0.0005:  # 0.5 pip movement
+                current_prices = entry_prices.copy()
+            previous_prices = np.array(
+                [position.get('current_price', position['entry_price']) for position in positions], dtype=np.float64
+            )
+            volumes = np.array([position['volume'] for position in positions], dtype=np.float64)
+            pip_multipliers = np.array([self.get_pip_value_multiplier(symbol) for symbol in symbols], dtype=np.float64)
+            directions = np.array([1.0 if position['direction'] == 'BUY' else -1.0 for position in positions])
+            
+            # P&L: signed price difference * volume * pip multiplier
+            pnls = (current_prices - entry_prices) * directions * volumes * pip_multipliers
+            price_changes = current_prices - previous_prices
+            total_unrealized_pnl = float(pnls.sum())
+            
+            for i, position in enumerate(positions):
+                position['current_price'] = float(current_prices[i])
+                position['pnl'] = float(pnls[i])
+                position['last_update'] = current_time
+            
+            # Track significant price movements (0.5 pip)
+            for i in np.flatnonzero(np.abs(price_changes) > 0.0005):
                 position_updates.append({
-                    'symbol': position['symbol'],
-                    'price_change': price_change,
-                    'pnl_change': price_change * position['volume'] * pip_multiplier * (1 if position['direction'] == 'BUY' else -1),
-                    'current_pnl': pnl
+                    'symbol': symbols[i],
+                    'price_change': price_changes[i],
+                    'pnl_change': price_changes[i] * volumes[i] * pip_multipliers[i] * directions[i],
+                    'current_pnl': pnls[i]
                 })
         
         # Update portfolio value: initial_balance + realized_pnl + unrealized_pnl
@@ -277,7 +316,7 @@ class FullDayTradingSimulation:
             closed_position = self.open_positions.pop(i)
             # Add realized P&L to running total
             self.realized_pnl += closed_position['pnl']
-            self.closed_trades.append(closed_position)
+            self._record_closed_trade(closed_position)
             self.log_event(f"📉 Position closed: {closed_position['symbol']} P&L: ${closed_position['pnl']:.2f}")
         
         # Update last position update time
@@ -356,6 +395,15 @@ class FullDayTradingSimulation:
         else:
             return pd.DataFrame()
     
+    def _record_closed_trade(self, position):
+        """Append a closed position to closed_trades and the closed-trade store"""
+        self.closed_trades.append(position)
+        self._closed.record(position)
+    
+    def closed_trades_df(self):
+        """Closed trades as a DataFrame (pnl, symbol, entry_time, exit_time), rebuilt only after new closes"""
+        return self._closed.to_df()
+    
     def log_event(self, message):
         """Log simulation events with timestamp"""
         timestamp = datetime.datetime.now().strftime("%H:%M:%S")
@@ -409,7 +457,7 @@ class FullDayTradingSimulation:
             # Close all positions and add to realized P&L
             for position in self.open_positions:
                 self.realized_pnl += position.get('pnl', 0.0)
-                self.closed_trades.append(position)
+                self._record_closed_trade(position)
                 self.log_event(f"📉 Emergency close: {position['symbol']} P&L: ${position.get('pnl', 0.0):.2f}")
             
             self.open_positions.clear()
@@ -425,7 +473,7 @@ class FullDayTradingSimulation:
             
             for position in self.open_positions:
                 self.realized_pnl += position.get('pnl', 0.0)
-                self.closed_trades.append(position)
+                self._record_closed_trade(position)
                 self.log_event(f"📉 Session close: {position['symbol']} P&L: ${position.get('pnl', 0.0):.2f}")
             
             self.open_positions.clear()
@@ -485,24 +533,7 @@ class FullDayTradingSimulation:
         """Collect market data for analysis for all symbols."""
         try:
             symbols = self.config['trading']['symbols'].split(',')
-            all_data = {}
-            for symbol in symbols:
-                timeframes = [mt5.TIMEFRAME_M5, mt5.TIMEFRAME_M15, mt5.TIMEFRAME_H1, mt5.TIMEFRAME_H4, mt5.TIMEFRAME_D1]
-                timeframe_bars = {
-                    mt5.TIMEFRAME_M5: 240,
-                    mt5.TIMEFRAME_M15: 80,
-                    mt5.TIMEFRAME_H1: 20,
-                    mt5.TIMEFRAME_H4: 120,
-                    mt5.TIMEFRAME_D1: 100
-                }
-
-                data = self.data_analyst.execute({
-                    'source': 'mt5',
-                    'symbol': symbol,
-                    'timeframes': timeframes,
-                    'num_bars': timeframe_bars
-                })
-                all_data[symbol] = data
+            all_data = asyncio.run(self._acollect_market_data(symbols))
             
             self.log_event(f"✅ Collected data for {len(all_data)} symbols")
             return all_data
@@ -510,6 +541,31 @@ class FullDayTradingSimulation:
             self.log_event(f"❌ Data collection error: {e}")
             return None
     
+    async def _acollect_market_data(self, symbols, max_concurrent_symbols=8):
+        """Fetch all symbols concurrently (bounded) over a single MT5 session."""
+        timeframes = [mt5.TIMEFRAME_M5, mt5.TIMEFRAME_M15, mt5.TIMEFRAME_H1, mt5.TIMEFRAME_H4, mt5.TIMEFRAME_D1]
+        timeframe_bars = {
+            mt5.TIMEFRAME_M5: 240,
+            mt5.TIMEFRAME_M15: 80,
+            mt5.TIMEFRAME_H1: 20,
+            mt5.TIMEFRAME_H4: 120,
+            mt5.TIMEFRAME_D1: 100
+        }
+        semaphore = asyncio.Semaphore(max_concurrent_symbols)
+        
+        async def fetch(symbol):
+            async with semaphore:
+                return await self.data_analyst.aexecute({
+                    'source': 'mt5',
+                    'symbol': symbol,
+                    'timeframes': timeframes,
+                    'num_bars': timeframe_bars
+                })
+        
+        with self.mt5_collector.session():
+            results = await asyncio.gather(*(fetch(symbol) for symbol in symbols))
+        return dict(zip(symbols, results))
+    
     def calculate_ufo_indicators(self, price_data):
         """Calculate UFO indicators from price data with enhanced oscillation and uncertainty analysis"""
         if not price_data:
@@ -517,24 +573,17 @@ class FullDayTradingSimulation:
             
         try:
             # Reshape the data for the UfoCalculator
-            reshaped_data = {}
+            closes_by_tf = {}
             for symbol, timeframe_data in price_data.items():
                 for timeframe, df in timeframe_data.items():
-                    if timeframe not in reshaped_data:
-                        reshaped_data[timeframe] = pd.DataFrame()
-                    reshaped_data[timeframe][symbol] = df['close']
+                    closes_by_tf.setdefault(timeframe, {})[symbol] = df['close']
+            reshaped_data = {timeframe: pd.concat(closes, axis=1) for timeframe, closes in closes_by_tf.items()}
 
-            incremental_sums_dict = {}
-            for timeframe, price_df in reshaped_data.items():
-                variation_data = self.ufo_calculator.calculate_percentage_variation(price_df)
-                incremental_sums_dict[timeframe] = self.ufo_calculator.calculate_incremental_sum(variation_data)
-            
-            ufo_data = self.ufo_calculator.generate_ufo_data(incremental_sums_dict)
+            # Variation -> incremental sum -> currency strength in one pass per timeframe
+            ufo_data = self.ufo_calculator.generate_ufo_data_from_prices(reshaped_data)
             
             # ENHANCED UFO ANALYSIS: Apply new oscillation and uncertainty detection
-            oscillation_analysis = self.ufo_calculator.detect_oscillations(ufo_data)
-            uncertainty_metrics = self.ufo_calculator.analyze_market_uncertainty(ufo_data, oscillation_analysis)
-            coherence_analysis = self.ufo_calculator.detect_timeframe_coherence(ufo_data)
+            oscillation_analysis, uncertainty_metrics, coherence_analysis = self.ufo_calculator.analyze(ufo_data)
             
             # Store enhanced analysis for decision making
             enhanced_ufo_data = {
@@ -651,9 +700,9 @@ class FullDayTradingSimulation:
             high_impact_events = daily_events[daily_events['impact'] == 'High']
             if not high_impact_events.empty:
                 self.log_event(f"⚠️ {len(high_impact_events)} HIGH IMPACT events scheduled for trading day:")
-                for _, event in high_impact_events.iterrows():
-                    event_time = f"{event['gmt_hour']:02d}:{event['gmt_minute']:02d}"
-                    self.log_event(f"  📅 {event_time} GMT: {event['country']} {event['title']}")
+                for event in high_impact_events.itertuples(index=False):
+                    event_time = f"{event.gmt_hour:02d}:{event.gmt_minute:02d}"
+                    self.log_event(f"  📅 {event_time} GMT: {event.country} {event.title}")
             
             return daily_events
             
@@ -827,13 +876,8 @@ class FullDayTradingSimulation:
             
             # Simulate trade execution
             try:
-                json_match = re.search(r'{.*}', trade_decisions, re.DOTALL)
-                if json_match:
-                    json_str = json_match.group(0)
-                    json_str = re.sub(r'//.*?\n', '\n', json_str)
-                    json_str = re.sub(r',\s*([}\]])', r'\1', json_str)
-                    
-                    parsed_data = json.loads(json_str)
+                parsed_data = parse_llm_json(trade_decisions)
+                if parsed_data is not None:
                     
                     # Extract trades
                     actions_list = []
@@ -858,7 +902,9 @@ class FullDayTradingSimulation:
                                     'currency_pair': trade.get('currency_pair')
                                 })
                     
-                    # Execute each trade
+                    # Resolve each new trade's symbol first so all their prices can be
+                    # fetched as one batch; actions are then applied in their original order
+                    resolved_actions = []
                     for action in actions_list:
                         if action.get('action') == 'new_trade':
                             symbol = action.get('symbol') or action.get('currency_pair', '')
@@ -890,25 +936,46 @@ class FullDayTradingSimulation:
                             else:
                                 full_symbol = corrected_symbol
                             
-                            # Generate realistic entry price based on symbol
-                            base_prices = {
-                                'EURUSD': 1.0850, 'GBPUSD': 1.2650, 'USDJPY': 143.50,
-                                'AUDUSD': 0.6720, 'USDCAD': 1.3580, 'NZDUSD': 0.6250,
-                                'EURJPY': 155.20, 'GBPJPY': 180.50, 'AUDJPY': 96.30,
-                                'USDCHF': 0.9120, 'EURCHF': 0.9880, 'GBPCHF': 1.1520,
-                                'AUDCAD': 0.9080, 'NZDJPY': 89.60, 'CADCHF': 0.6730,
-                                'CHFJPY': 157.20, 'AUDNZD': 1.0750, 'EURGBP': 0.8590,
-                                'GBPCAD': 1.7180, 'XAUUSD': 1850.00, 'GBPAUD': 1.8820,
-                                'NZDCAD': 0.8470, 'EURAUD': 1.6150, 'USDAUD': 1.4880,
-                                'CHFGBP': 0.8680, 'GBPEUR': 1.1640
-                            }
-                            
+                            resolved_actions.append(('new_trade', (full_symbol, direction, volume)))
+
+                        elif action.get('action') == 'close_trade':
+                            resolved_actions.append(('close_trade', action.get('trade_id')))
+                    
+                    prices, m5_latest = {}, None
+                    symbols = list(dict.fromkeys(
+                        payload[0] for kind, payload in resolved_actions if kind == 'new_trade'
+                    ))
+                    if symbols:
+                        # One concurrent batch of MT5 price lookups and one read of the
+                        # latest M5 strengths, shared by every new trade this cycle
+                        with ThreadPoolExecutor(max_workers=min(len(symbols), 8)) as executor:
+                            prices = dict(zip(symbols, executor.map(
+                                lambda symbol: self.get_historical_price_for_time(symbol, current_time), symbols
+                            )))
+                        m5_latest = self._latest_m5_strengths(ufo_data) if ufo_data else None
+                    
+                    # Execute each action in the order the fund manager gave them
+                    for kind, payload in resolved_actions:
+                        if kind == 'close_trade':
+                            trade_id = payload
+                            if trade_id:
+                                position_to_close = next((p for p in self.open_positions if p.get('ticket') == trade_id), None)
+                                if position_to_close:
+                                    self.open_positions.remove(position_to_close)
+                                    self.realized_pnl += position_to_close.get('pnl', 0.0)
+                                    self._record_closed_trade(position_to_close)
+                                    self.log_event(f"🔹 Trade closed by LLM: {position_to_close['symbol']} P&L: ${position_to_close.get('pnl', 0.0):.2f}")
+                                    executed_count += 1
+                        else:
+                            full_symbol, direction, volume = payload
                             # Use UFO-based entry price calculation for more realistic execution
                             entry_price = self.calculate_ufo_entry_price(
                                 full_symbol, 
                                 direction, 
                                 ufo_data,
-                                current_time
+                                current_time,
+                                prices=prices,
+                                m5_latest=m5_latest
                             )
                             
                             # Create position info
@@ -930,18 +997,6 @@ class FullDayTradingSimulation:
                             executed_count += 1
                             
                             self.log_event(f"🔹 Trade executed: {full_symbol} {direction} {volume} lots @ {position_info['entry_price']:.5f}")
-
-                        elif action.get('action') == 'close_trade':
-                            trade_id = action.get('trade_id')
-                            if trade_id:
-                                position_to_close = next((p for p in self.open_positions if p.get('ticket') == trade_id), None)
-                                if position_to_close:
-                                    self.open_positions.remove(position_to_close)
-                                    self.realized_pnl += position_to_close.get('pnl', 0.0)
-                                    self.closed_trades.append(position_to_close)
-                                    self.log_event(f"🔹 Trade closed by LLM: {position_to_close['symbol']} P&L: ${position_to_close.get('pnl', 0.0):.2f}")
-                                    executed_count += 1
-                            continue # Continue to next action
                             
             except Exception as e:
                 self.log_event(f"❌ Trade execution error: {e}")
@@ -953,18 +1008,25 @@ class FullDayTradingSimulation:
     
     def generate_cycle_summary(self, cycle_time, executed_trades):
         """Generate summary for this cycle"""
-        # Calculate unrealized P&L from open positions
-        unrealized_pnl = sum(pos.get('pnl', 0.0) for pos in self.open_positions)
-        total_pnl = self.portfolio_value - self.initial_balance
-        
-        self.log_event(f"📊 Cycle {self.cycle_count} Summary ({cycle_time} GMT):")
-        self.log_event(f"   Trades Executed: {executed_trades}")
-        self.log_event(f"   Total Trades Today: {len(self.trades_executed)}")
-        self.log_event(f"   Open Positions: {len(self.open_positions)}/{self.max_concurrent_positions}")
-        self.log_event(f"   Closed Trades: {len(self.closed_trades)}")
-        self.log_event(f"   Realized P&L: ${self.realized_pnl:+,.2f}")
-        self.log_event(f"   Unrealized P&L: ${unrealized_pnl:+,.2f}")
-        self.log_event(f"   Portfolio Value: ${self.portfolio_value:,.2f} (Total P&L: ${total_pnl:+,.2f})")
+        log_event = self.log_event
+        open_positions = self.open_positions
+        portfolio_value = self.portfolio_value
+        
+        # Unrealized P&L and profitable-position count from open positions in one pass
+        open_pnl = np.fromiter(
+            (pos.get('pnl', 0.0) for pos in open_positions), dtype=np.float64, count=len(open_positions)
+        )
+        unrealized_pnl, open_winners = summary_stats(open_pnl)
+        total_pnl = portfolio_value - self.initial_balance
+        
+        log_event(f"📊 Cycle {self.cycle_count} Summary ({cycle_time} GMT):")
+        log_event(f"   Trades Executed: {executed_trades}")
+        log_event(f"   Total Trades Today: {len(self.trades_executed)}")
+        log_event(f"   Open Positions: {len(open_positions)}/{self.max_concurrent_positions} ({open_winners} in profit)")
+        log_event(f"   Closed Trades: {len(self.closed_trades)}")
+        log_event("   Realized P&L: $" + fmt_signed(self.realized_pnl))
+        log_event("   Unrealized P&L: $" + fmt_signed(unrealized_pnl))
+        log_event(f"   Portfolio Value: ${fmt_unsigned(portfolio_value)} (Total P&L: ${fmt_signed(total_pnl)})")
     
     def run_full_day_simulation(self):
         """Run the complete full-day simulation from 0 GMT to 18 GMT every 40 minutes"""
@@ -1011,47 +1073,60 @@ class FullDayTradingSimulation:
     
     def generate_final_summary(self):
         """Generate final summary of the full day"""
-        self.log_event("\n" + "="*80)
-        self.log_event("🎯 FULL DAY SIMULATION COMPLETED")
-        self.log_event("="*80)
-        self.log_event(f"📅 Date: {self.simulation_date.strftime('%A, %B %d, %Y')}")
-        self.log_event(f"⏰ Total Cycles: {self.cycle_count}")
-        self.log_event(f"💼 Total Trades Executed: {len(self.trades_executed)}")
-        self.log_event(f"💰 Final Portfolio Value: ${self.portfolio_value:,.2f}")
-        
-        if self.trades_executed:
-            self.log_event("\n📈 EXECUTED TRADES SUMMARY:")
-            for i, trade in enumerate(self.trades_executed, 1):
-                self.log_event(f"  {i}. {trade['symbol']} {trade['direction']} {trade['volume']} @ {trade['entry_price']:.5f} ({trade['comment']})")
-        
-        final_positions = 2 + len(self.trades_executed)
-        self.log_event(f"\n🎯 Final Diversification Status:")
-        self.log_event(f"   Positions: {final_positions}/{self.max_concurrent_positions}")
-        self.log_event(f"   Target: {self.target_positions_when_available}")
-        self.log_event(f"   Minimum: {self.min_positions_for_session}")
-        
-        if final_positions >= self.target_positions_when_available:
-            self.log_event("   Status: ✅ Well Diversified")
-        elif final_positions >= self.min_positions_for_session:
-            self.log_event("   Status: 📈 Building Diversification") 
+        log_event = self.log_event
+        trades_executed = self.trades_executed
+        max_concurrent_positions = self.max_concurrent_positions
+        target_positions = self.target_positions_when_available
+        min_positions = self.min_positions_for_session
+        
+        log_event("\n" + "="*80)
+        log_event("🎯 FULL DAY SIMULATION COMPLETED")
+        log_event("="*80)
+        log_event(f"📅 Date: {self.simulation_date.strftime('%A, %B %d, %Y')}")
+        log_event(f"⏰ Total Cycles: {self.cycle_count}")
+        log_event(f"💼 Total Trades Executed: {len(trades_executed)}")
+        log_event("💰 Final Portfolio Value: $" + fmt_unsigned(self.portfolio_value))
+        
+        closed_count = len(self._closed)
+        if closed_count:
+            winners = self._closed.winners
+            log_event(f"📉 Closed Trades: {closed_count} (Winners: {winners}, Losers: {closed_count - winners})")
+            log_event(f"   Closed P&L: ${fmt_signed(self._closed.total_pnl)} | Win Rate: {winners * 100.0 / closed_count:.1f}%")
+        
+        if trades_executed:
+            log_event("\n📈 EXECUTED TRADES SUMMARY:")
+            for i, trade in enumerate(trades_executed, 1):
+                log_event(f"  {i}. {trade['symbol']} {trade['direction']} {trade['volume']} @ {trade['entry_price']:.5f} ({trade['comment']})")
+        
+        final_positions = 2 + len(trades_executed)
+        log_event(f"\n🎯 Final Diversification Status:")
+        log_event(f"   Positions: {final_positions}/{max_concurrent_positions}")
+        log_event(f"   Target: {target_positions}")
+        log_event(f"   Minimum: {min_positions}")
+        
+        if final_positions >= target_positions:
+            log_event("   Status: ✅ Well Diversified")
+        elif final_positions >= min_positions:
+            log_event("   Status: 📈 Building Diversification") 
         else:
-            self.log_event("   Status: ⚠️ Below Minimum Diversification")
+            log_event("   Status: ⚠️ Below Minimum Diversification")
     
     def save_full_day_report(self):
         """Save the complete full-day simulation report"""
         report_filename = f"full_day_simulation_{self.simulation_date.strftime('%Y%m%d')}.txt"
         report_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), report_filename)
         
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write("UFO FOREX AGENT v3 - FULL DAY SIMULATION REPORT\n")
-            f.write("=" * 60 + "\n")
-            f.write(f"Date: {self.simulation_date.strftime('%A, %B %d, %Y')}\n")
-            f.write(f"Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Cycle Period: {self.cycle_period_minutes} minutes\n")
-            f.write(f"Total Cycles: {self.cycle_count}\n\n")
+        # Streamed straight to a large write buffer; the report is never held as one string
+        with open(report_path, 'w', encoding='utf-8', buffering=65536) as f:
+            write = f.write
+            write("UFO FOREX AGENT v3 - FULL DAY SIMULATION REPORT\n")
+            write("=" * 60 + "\n")
+            write(f"Date: {self.simulation_date.strftime('%A, %B %d, %Y')}\n")
+            write(f"Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            write(f"Cycle Period: {self.cycle_period_minutes} minutes\n")
+            write(f"Total Cycles: {self.cycle_count}\n\n")
             
-            for log_entry in self.simulation_log:
-                f.write(log_entry + "\n")
+            f.writelines(log_entry + "\n" for log_entry in self.simulation_log)
         
         self.log_event(f"\n📁 Full day report saved: {report_filename}")
         return report_path
@@ -1065,9 +1140,9 @@ class FullDayTradingSimulation:
             if current_price:
                 market_data[symbol] = {
                     'close': current_price,
-                    'ask': current_price + 0.0001,  # Estimated spread for simulation
+                    'ask': current_price + _SIM_SPREAD,  # Estimated spread for simulation
                     'bid': current_price,
-                    'spread': 0.0001,
+                    'spread': _SIM_SPREAD,
                     'timestamp': current_time
                 }
         return market_data
@@ -1083,28 +1158,28 @@ class FullDayTradingSimulation:
             return current_market_data
         
         # Check if we've already collected data for this exact time to prevent loops
-        cache_key = f"market_data_{current_time}"
-        if hasattr(self, '_market_data_cache') and cache_key in self._market_data_cache:
-            return self._market_data_cache[cache_key]
-        
-        # Initialize cache if needed
-        if not hasattr(self, '_market_data_cache'):
-            self._market_data_cache = {}
+        cache_key = int(current_time.timestamp()) if current_time is not None else None
+        cached = self._market_data_cache.get(cache_key)
+        if cached is not None:
+            return cached
             
         try:
             # Extract unique symbols from positions
             symbols_to_fetch = set()
             
             # Handle both DataFrame and list formats
-            if hasattr(open_positions, 'iterrows'):
-                # DataFrame format
-                for _, position in open_positions.iterrows():
-                    symbols_to_fetch.add(position['symbol'])
+            if hasattr(open_positions, 'columns'):
+                # DataFrame format: de-duplicate in pandas' hash table, not a Python loop
+                symbols_to_fetch.update(open_positions['symbol'].unique().tolist())
             else:
                 # List format (self.open_positions)
                 for position in open_positions:
                     symbols_to_fetch.add(position['symbol'])
             
+            # One timestamp for the whole collection
+            timestamp = current_time or datetime.datetime.now()
+            fallback_logged = False
+            
             # Get historical price data for each symbol at current simulation time
             for symbol in symbols_to_fetch:
                 try:
@@ -1112,48 +1187,39 @@ class FullDayTradingSimulation:
                     if current_price:
                         current_market_data[symbol] = {
                             'close': current_price,
-                            'ask': current_price + 0.0001,  # Estimated spread for simulation
+                            'ask': current_price + _SIM_SPREAD,  # Estimated spread for simulation
                             'bid': current_price,
-                            'spread': 0.0001,
-                            'timestamp': current_time or datetime.datetime.now()
+                            'spread': _SIM_SPREAD,
+                            'timestamp': timestamp
                         }
                         # Reduce logging frequency to prevent spam
                         if len(current_market_data) == 1:  # Only log once per collection
                             self.log_event(f"📊 Historical data collected for {len(symbols_to_fetch)} symbols at {current_time}")
                     else:
                         # Fallback to base prices if historical data fails
-                        base_prices = {
-                            'EURUSD-ECN': 1.0850, 'GBPUSD-ECN': 1.2650, 'USDJPY-ECN': 143.50,
-                            'AUDUSD-ECN': 0.6720, 'USDCAD-ECN': 1.3580, 'NZDUSD-ECN': 0.6250,
-                            'EURJPY-ECN': 155.20, 'GBPJPY-ECN': 180.50, 'AUDJPY-ECN': 96.30,
-                            'USDCHF-ECN': 0.9120, 'EURCHF-ECN': 0.9880, 'GBPCHF-ECN': 1.1520,
-                            'AUDCAD-ECN': 0.9080, 'NZDJPY-ECN': 89.60, 'CADCHF-ECN': 0.6730,
-                            'CHFJPY-ECN': 157.20, 'AUDNZD-ECN': 1.0750, 'EURGBP-ECN': 0.8590,
-                            'GBPCAD-ECN': 1.7180, 'XAUUSD-ECN': 1850.00, 'GBPAUD-ECN': 1.8820
-                        }
-                        fallback_price = base_prices.get(symbol, 1.0850)
+                        fallback_price = _FALLBACK_PRICES.get(symbol, 1.0850)
                         current_market_data[symbol] = {
                             'close': fallback_price,
-                            'ask': fallback_price + 0.0001,
+                            'ask': fallback_price + _SIM_SPREAD,
                             'bid': fallback_price,
-                            'spread': 0.0001,
-                            'timestamp': current_time or datetime.datetime.now()
+                            'spread': _SIM_SPREAD,
+                            'timestamp': timestamp
                         }
                         # Only log fallback usage once
-                        if symbol == list(symbols_to_fetch)[0]:
+                        if not fallback_logged:
+                            fallback_logged = True
                             self.log_event(f"📊 Using fallback prices for {len(symbols_to_fetch)} symbols")
                         
                 except Exception as e:
                     self.log_event(f"❌ Error getting market data for {symbol}: {e}")
                     continue
             
-            # Cache the results to prevent repeated collection for same time
-            self._market_data_cache[cache_key] = current_market_data
-            
-            # Clean old cache entries (keep only last 10 entries)
-            if len(self._market_data_cache) > 10:
-                oldest_key = list(self._market_data_cache.keys())[0]
-                del self._market_data_cache[oldest_key]
+            # Cache the results to prevent repeated collection for same time,
+            # evicting the oldest entry in O(1) once the cache is full
+            cache = self._market_data_cache
+            if len(cache) >= self._market_data_cache_size:
+                cache.popitem(last=False)
+            cache[cache_key] = current_market_data
             
             if len(current_market_data) > 0:
                 self.log_event(f"✅ Market data cached for {len(current_market_data)} symbols")
@@ -1194,41 +1260,16 @@ class FullDayTradingSimulation:
             current_strengths = current_raw_data[timeframe]
             previous_strengths = previous_raw_data[timeframe]
             
-            # Handle both DataFrame and dict formats
-            if hasattr(current_strengths, 'columns'):
-                # DataFrame format
-                currency_list = current_strengths.columns
-            else:
-                # Dict format
-                currency_list = current_strengths.keys()
-            
-            # Detect significant strength changes
-            for currency in currency_list:
-                if hasattr(previous_strengths, 'columns'):
-                    # DataFrame format
-                    if currency not in previous_strengths.columns:
-                        continue
-                    current_strength = current_strengths[currency].iloc[-1]
-                    previous_strength = previous_strengths[currency].iloc[-5:]  # Last 5 bars average
-                    avg_previous = previous_strength.mean()
-                else:
-                    # Dict format
-                    if currency not in previous_strengths:
-                        continue
-                    current_strength = current_strengths[currency][-1]
-                    previous_strength = previous_strengths[currency][-5:]  # Last 5 bars average
-                    avg_previous = sum(previous_strength) / len(previous_strength)
-                
-                # Signal strength reversal (threshold can be tuned)
-                if abs(current_strength - avg_previous) > 2.0:  # Significant change
-                    direction_change = "strengthening" if current_strength > avg_previous else "weakening"
-                    exit_signals.append({
-                        'currency': currency,
-                        'timeframe': timeframe,
-                        'change': current_strength - avg_previous,
-                        'direction': direction_change,
-                        'reason': f"{currency} {direction_change} on {timeframe}"
-                    })
+            # Detect significant strength changes (DataFrame or dict format, JIT kernel)
+            for currency, change in detect_strength_changes(current_strengths, previous_strengths, threshold=2.0):
+                direction_change = "strengthening" if change > 0 else "weakening"
+                exit_signals.append({
+                    'currency': currency,
+                    'timeframe': timeframe,
+                    'change': change,
+                    'direction': direction_change,
+                    'reason': f"{currency} {direction_change} on {timeframe}"
+                })
         
         return exit_signals
     
@@ -1241,27 +1282,27 @@ class FullDayTradingSimulation:
         for signal in exit_signals:
             currencies_to_close.add(signal['currency'])
         
-        # Find positions that involve these currencies
-        positions_to_close = []
-        for i, position in enumerate(self.open_positions):
-            symbol = position['symbol'].replace('-ECN', '')
-            
-            # Extract base and quote currencies
-            if len(symbol) >= 6:
-                base_currency = symbol[:3]
-                quote_currency = symbol[3:6]
-                
-                # Check if either currency is affected by exit signals
-                if base_currency in currencies_to_close or quote_currency in currencies_to_close:
-                    positions_to_close.append(i)
-                    self.log_event(f"🚨 Marking {symbol} for closure due to {base_currency}/{quote_currency} exit signals")
+        if not self.open_positions or not currencies_to_close:
+            return positions_closed
+        
+        # Find positions that involve these currencies: base/quote columns matched in one pass
+        symbols = [position['symbol'].replace('-ECN', '') for position in self.open_positions]
+        base_currencies = np.array([symbol[:3] for symbol in symbols])
+        quote_currencies = np.array([symbol[3:6] for symbol in symbols])
+        has_pair = np.array([len(symbol) >= 6 for symbol in symbols])
+        affected = np.array(sorted(currencies_to_close))
+        
+        mask = has_pair & (np.isin(base_currencies, affected) | np.isin(quote_currencies, affected))
+        positions_to_close = np.flatnonzero(mask).tolist()
+        for i in positions_to_close:
+            self.log_event(f"🚨 Marking {symbols[i]} for closure due to {base_currencies[i]}/{quote_currencies[i]} exit signals")
         
         # Close positions (in reverse order to maintain indices)
         for i in reversed(positions_to_close):
             closed_position = self.open_positions.pop(i)
             # Add realized P&L to running total
             self.realized_pnl += closed_position.get('pnl', 0.0)
-            self.closed_trades.append(closed_position)
+            self._record_closed_trade(closed_position)
             positions_closed += 1
             self.log_event(f"📉 Exit signal close: {closed_position['symbol']} P&L: ${closed_position.get('pnl', 0.0):.2f}")
         
@@ -1271,11 +1312,30 @@ class FullDayTradingSimulation:
         
         return positions_closed
     
-    def calculate_ufo_entry_price(self, symbol, direction, ufo_data, current_time):
-        """Calculate optimal entry price based on UFO methodology and currency strength"""
+    def _latest_m5_strengths(self, ufo_data):
+        """Latest M5 strength per currency from UFO data, or None when M5 is missing"""
+        raw_ufo_data = ufo_data.get('raw_data', ufo_data)
+        strength_data = raw_ufo_data.get(mt5.TIMEFRAME_M5)
+        if strength_data is None:
+            return None
+        
+        # Handle both DataFrame and dict formats
+        if hasattr(strength_data, 'columns'):
+            return strength_data.iloc[-1].to_dict()
+        return {currency: values[-1] for currency, values in strength_data.items()}
+    
+    def calculate_ufo_entry_price(self, symbol, direction, ufo_data, current_time, prices=None, m5_latest=None):
+        """
+        Calculate optimal entry price based on UFO methodology and currency strength.
+        `prices` ({symbol: price}) and `m5_latest` ({currency: strength}) let callers
+        pricing several trades fetch them once up front.
+        """
         try:
             # Get base historical price
-            base_price = self.get_historical_price_for_time(symbol, current_time)
+            if prices is not None and symbol in prices:
+                base_price = prices[symbol]
+            else:
+                base_price = self.get_historical_price_for_time(symbol, current_time)
             if base_price is None:
                 # Fallback to standard base prices
                 base_prices = {
@@ -1291,35 +1351,17 @@ class FullDayTradingSimulation:
             
             # Calculate UFO adjustment if UFO data is available
             if ufo_data:
-                # Extract currencies from symbol
-                clean_symbol = symbol.replace('-ECN', '')
-                if len(clean_symbol) >= 6:
-                    base_currency = clean_symbol[:3]
-                    quote_currency = clean_symbol[3:6]
+                # Extract currencies from symbol (parsed once per symbol)
+                base_currency, quote_currency = _parse_pair(symbol)
+                if base_currency is not None:
                     
                     # Get currency strengths from M5 timeframe (primary trading timeframe)
-                    primary_tf = mt5.TIMEFRAME_M5
-                    raw_ufo_data = ufo_data.get('raw_data', ufo_data)
+                    if m5_latest is None:
+                        m5_latest = self._latest_m5_strengths(ufo_data)
                     
-                    if primary_tf in raw_ufo_data:
-                        strength_data = raw_ufo_data[primary_tf]
-                        
-                        base_strength = 0.0
-                        quote_strength = 0.0
-                        
-                        # Handle both DataFrame and dict formats
-                        if hasattr(strength_data, 'columns'):
-                            # DataFrame format
-                            if base_currency in strength_data.columns:
-                                base_strength = strength_data[base_currency].iloc[-1]
-                            if quote_currency in strength_data.columns:
-                                quote_strength = strength_data[quote_currency].iloc[-1]
-                        else:
-                            # Dict format
-                            if base_currency in strength_data:
-                                base_strength = strength_data[base_currency][-1]
-                            if quote_currency in strength_data:
-                                quote_strength = strength_data[quote_currency][-1]
+                    if m5_latest is not None:
+                        base_strength = m5_latest.get(base_currency, 0.0)
+                        quote_strength = m5_latest.get(quote_currency, 0.0)
                         
                         # Calculate strength differential
                         strength_diff = base_strength - quote_strength
@@ -1396,7 +1438,7 @@ class FullDayTradingSimulation:
                 return
             
             # Check if we've already monitored this exact time to prevent loops
-            if hasattr(self, '_last_monitoring_time') and self._last_monitoring_time == current_time:
+            if self._last_monitoring_time == current_time:
                 return
             self._last_monitoring_time = current_time
             
@@ -1409,10 +1451,10 @@ class FullDayTradingSimulation:
                 if len(recent_changes) >= 2:
                     latest_value = recent_changes[-1]['portfolio_value']
                     previous_value = recent_changes[-2]['portfolio_value']
-                    rapid_change = abs(latest_value - previous_value) / previous_value * 100
+                    rapid_change = (latest_value - previous_value) / previous_value * 100 if previous_value else 0.0
                     
-                    if rapid_change > 1.0:  # 1% rapid change threshold
-                        self.log_event(f"⚡ Rapid portfolio change: {rapid_change:.2f}% in {self.position_update_frequency_minutes} min")
+                    if rapid_change * rapid_change > 1.0:  # 1% rapid change threshold (squared)
+                        self.log_event(f"⚡ Rapid portfolio change: {abs(rapid_change):.2f}% in {self.position_update_frequency_minutes} min")
                         
                         # Check if portfolio stop is approaching
                         current_drawdown = ((latest_value - self.initial_balance) / self.initial_balance) * 100
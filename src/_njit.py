@@ -0,0 +1,18 @@
+"""
+Optional Numba support. `njit` compiles with numba when it is installed and is a
+no-op decorator otherwise, so kernels stay importable (and correct) without it.
+"""
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        # Support both @njit and @njit(cache=True, ...)
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
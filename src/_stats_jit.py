@@ -0,0 +1,18 @@
+"""
+Single-pass P&L reductions for the trade summaries. JIT-compiled when numba is
+available (see _njit.py), plain Python loops otherwise.
+"""
+from ._njit import njit
+
+
+@njit(cache=True)
+def summary_stats(pnl):
+    """Returns (total, winners) for a float64 P&L array in one pass."""
+    total = 0.0
+    winners = 0
+    for i in range(pnl.shape[0]):
+        value = pnl[i]
+        total += value
+        if value > 0:
+            winners += 1
+    return total, winners
@@ -0,0 +1,217 @@
+"""
+Numeric kernels for the UFO hot paths. Kernels operate on dense float64 arrays and
+are JIT-compiled when numba is available (see _njit.py).
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from ._njit import njit, NUMBA_AVAILABLE
+
+
+@njit(cache=True)
+def _strength_change_kernel(current_last, previous_tail):
+    """
+    current_last: (n_currencies,) latest strengths.
+    previous_tail: (n_currencies, window) previous strengths, NaN-padded.
+    Returns current_last minus the NaN-skipping mean of each previous row.
+    """
+    n, window = previous_tail.shape
+    changes = np.empty(n)
+    for i in range(n):
+        total = 0.0
+        count = 0
+        for j in range(window):
+            value = previous_tail[i, j]
+            if not np.isnan(value):
+                total += value
+                count += 1
+        if count == 0:
+            changes[i] = np.nan
+        else:
+            changes[i] = current_last[i] - total / count
+    return changes
+
+
+@njit(cache=True)
+def _oscillation_stats_kernel(tails):
+    """
+    tails: (n_currencies, lookback) most recent strengths per currency, no NaNs.
+    Returns (volatility, mean, current, reversals, trending) per currency: sample std
+    (ddof=1, as pandas), mean, last value, count of sign flips between consecutive
+    bar-to-bar changes, and whether the last three values sit all above or all below the mean.
+    """
+    n, lookback = tails.shape
+    volatility = np.zeros(n)
+    mean = np.zeros(n)
+    current = np.zeros(n)
+    reversals = np.zeros(n, dtype=np.int64)
+    trending = np.zeros(n, dtype=np.bool_)
+    for i in range(n):
+        total = 0.0
+        for j in range(lookback):
+            total += tails[i, j]
+        mu = total / lookback
+        squares = 0.0
+        for j in range(lookback):
+            d = tails[i, j] - mu
+            squares += d * d
+        volatility[i] = np.sqrt(squares / (lookback - 1)) if lookback > 1 else np.nan
+        mean[i] = mu
+        current[i] = tails[i, lookback - 1]
+
+        flips = 0
+        for j in range(2, lookback):
+            prev_change = tails[i, j - 1] - tails[i, j - 2]
+            change = tails[i, j] - tails[i, j - 1]
+            if (prev_change > 0 and change < 0) or (prev_change < 0 and change > 0):
+                flips += 1
+        reversals[i] = flips
+
+        above = True
+        below = True
+        for j in range(max(0, lookback - 3), lookback):
+            if not tails[i, j] > mu:
+                above = False
+            if not tails[i, j] < mu:
+                below = False
+        trending[i] = above or below
+    return volatility, mean, current, reversals, trending
+
+
+def oscillation_stats(ufo_frame, currencies, lookback):
+    """
+    Runs the oscillation kernel over the last `lookback` bars of the given currency
+    columns of a UFO strength frame. Returns the kernel's per-currency arrays.
+    """
+    tails = np.ascontiguousarray(
+        ufo_frame[currencies].iloc[-lookback:].to_numpy(dtype=np.float64).T
+    )
+    return _oscillation_stats_kernel(tails)
+
+
+# Reinforcement entry kinds, resolved from the plan/event strings at the Python layer
+KIND_MOMENTUM, KIND_COMPENSATION, KIND_RAPID_LOSS, KIND_VOLATILITY, KIND_STANDARD = 0, 1, 2, 3, 4
+
+
+@lru_cache(maxsize=128)
+def reinforcement_kind(reinforcement_type, event_type):
+    """
+    Maps a reinforcement type and market-event type to a KIND_* code (first match wins).
+    Both come from a small fixed vocabulary, so the classification is memoized and a
+    repeat pair costs one hash lookup instead of two lower() calls and four scans.
+    """
+    reinforcement_type = reinforcement_type.lower()
+    event_type = event_type.lower()
+    if 'momentum' in reinforcement_type:
+        return KIND_MOMENTUM
+    if 'compensation' in reinforcement_type:
+        return KIND_COMPENSATION
+    if 'rapid_loss' in event_type:
+        return KIND_RAPID_LOSS
+    if 'volatility' in event_type:
+        return KIND_VOLATILITY
+    return KIND_STANDARD
+
+
+@njit(cache=True)
+def reinforcement_entry_price(is_buy, bid, ask, spread, kind, volatility_multiplier):
+    """
+    Entry price for a reinforcement trade: the touch price (ask for BUY, bid for SELL)
+    shifted by the kind's spread fraction, capped at two spreads beyond the touch.
+    Returns (price, adjustment).
+    """
+    side = 1.0 if is_buy else -1.0
+    base_price = ask if is_buy else bid
+    if kind == KIND_MOMENTUM:
+        adjustment = side * spread * 0.5       # pay half a spread for urgency
+    elif kind == KIND_COMPENSATION:
+        adjustment = -side * spread * 0.25     # work for a slightly better fill
+    elif kind == KIND_VOLATILITY:
+        adjustment = side * spread * volatility_multiplier  # slippage buffer
+    else:
+        adjustment = 0.0                       # rapid-loss / standard: at market
+    price = base_price + adjustment
+    if is_buy:
+        price = min(price, ask + spread * 2)
+    else:
+        price = max(price, bid - spread * 2)
+    return price, adjustment
+
+
+@njit(cache=True)
+def strength_entry_adjustment(is_buy, spread, strength_diff):
+    """
+    UFO strength-differential price adjustment for a new entry. Returns (adjustment,
+    signal) with signal 1 = favorable, 0 = cautious, -1 = neutral (|diff| <= 1).
+    """
+    if abs(strength_diff) <= 1.0:
+        return 0.0, -1
+    if is_buy:
+        if strength_diff > 0:
+            return -spread * 0.2, 1
+        return spread * 0.1, 0
+    if strength_diff < 0:
+        return spread * 0.2, 1
+    return -spread * 0.1, 0
+
+
+@njit(cache=True)
+def bound_entry_price(is_buy, price, bid, ask, spread):
+    """Keeps a UFO entry within 1.5 spreads beyond the touch and half a spread inside it."""
+    if is_buy:
+        return max(min(price, ask + spread * 1.5), bid - spread * 0.5)
+    return min(max(price, bid - spread * 1.5), ask + spread * 0.5)
+
+
+def _stack_strengths(current_strengths, previous_strengths, window):
+    """Aligns the currencies present in both inputs into dense kernel arrays."""
+    if hasattr(current_strengths, 'columns') and hasattr(previous_strengths, 'columns'):
+        currencies = [c for c in current_strengths.columns if c in previous_strengths.columns]
+        if not currencies or current_strengths.empty or previous_strengths.empty:
+            return currencies, None, None
+        current_last = current_strengths[currencies].iloc[-1].to_numpy(dtype=np.float64)
+        previous_tail = np.ascontiguousarray(
+            previous_strengths[currencies].iloc[-window:].to_numpy(dtype=np.float64).T
+        )
+        return currencies, current_last, previous_tail
+
+    currencies = [c for c in current_strengths.keys() if c in previous_strengths]
+    if not currencies:
+        return currencies, None, None
+    current_last = np.array([current_strengths[c][-1] for c in currencies], dtype=np.float64)
+    previous_tail = np.full((len(currencies), window), np.nan)
+    for i, currency in enumerate(currencies):
+        tail = list(previous_strengths[currency][-window:])
+        if tail:
+            previous_tail[i, :len(tail)] = tail
+    return currencies, current_last, previous_tail
+
+
+def detect_strength_changes(current_strengths, previous_strengths, threshold=2.0, window=5):
+    """
+    Returns [(currency, change)] for currencies whose latest strength differs from the
+    mean of the previous `window` bars by more than `threshold`. Accepts DataFrames
+    (columns = currencies) or dicts of sequences.
+    """
+    currencies, current_last, previous_tail = _stack_strengths(current_strengths, previous_strengths, window)
+    if current_last is None:
+        return []
+    changes = _strength_change_kernel(current_last, previous_tail)
+    # NaN compares False, matching the previous pandas behaviour
+    hits = np.nonzero(np.abs(changes) > threshold)[0]
+    return [(currencies[i], float(changes[i])) for i in hits]
+
+
+def warm_up():
+    """
+    Compiles the kernels on tiny inputs so the first trading cycle doesn't pay the
+    JIT cost. With cache=True this loads from the on-disk cache after the first run.
+    """
+    if not NUMBA_AVAILABLE:
+        return
+    _strength_change_kernel(np.zeros(2), np.zeros((2, 5)))
+    _oscillation_stats_kernel(np.zeros((2, 20)))
+    reinforcement_entry_price(True, 1.0, 1.0001, 0.0001, KIND_STANDARD, 1.0)
+    strength_entry_adjustment(True, 0.0001, 0.0)
+    bound_entry_price(True, 1.0, 1.0, 1.0001, 0.0001)
@@ -1,3 +1,5 @@
+import asyncio
+
 class Agent:
     def __init__(self, name, llm_client=None):
         self.name = name
@@ -5,3 +7,10 @@ class Agent:
 
     def execute(self, *args, **kwargs):
         raise NotImplementedError("This method should be overridden by subclasses.")
+
+    async def aexecute(self, *args, **kwargs):
+        """
+        Async wrapper around execute(). The LLM and MT5 clients are blocking, so the
+        call runs in a worker thread and independent agents can be awaited together.
+        """
+        return await asyncio.to_thread(self.execute, *args, **kwargs)
@@ -1,60 +1,424 @@
 from .base_agent import Agent
-from ..data_collector import EconomicCalendarCollector
+from ..data_collector import EconomicCalendarCollector, TERMINAL_MT5_ERRORS
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio
+from pathlib import Path
+import logging
+import os
+import time
 import pandas as pd
 
+try:
+    import pyarrow  # noqa: F401  (enables the Parquet bar cache)
+    _PARQUET_AVAILABLE = True
+except ImportError:
+    _PARQUET_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def _timeframe_seconds(timeframe):
+    """Approximate bar duration in seconds for an MT5 timeframe constant."""
+    if timeframe < 16384:  # M1..M30 are encoded as minutes
+        return timeframe * 60
+    if timeframe < 32768:  # H1..D1 are encoded as 16384 + hours
+        return (timeframe - 16384) * 3600
+    if timeframe < 49152:  # W1
+        return 7 * 24 * 3600
+    return 30 * 24 * 3600  # MN1
+
+# OHLCV columns stored as float32: ~7 significant digits covers FX quotes
+# (e.g. 1.08345 / 151.234) while halving memory and cache size
+_FLOAT32_COLUMNS = ('open', 'high', 'low', 'close', 'tick_volume')
+
+
+def _downcast(df):
+    """Downcasts OHLCV columns of an MT5 bar DataFrame to float32."""
+    if df is None or df.empty:
+        return df
+    return df.astype({column: 'float32' for column in _FLOAT32_COLUMNS if column in df.columns}, copy=False)
+
+
+def _mark_read_only(df):
+    """
+    Best-effort guard for cached DataFrames: flags each column's array as non-writeable,
+    so writes through df[column].values raise. It does not cover df.loc/df.iloc
+    assignment (pandas may write through its own 2-D block) or column insertion, so
+    consumers that need to modify bars must work on a copy.
+    """
+    for column in df.columns:
+        try:
+            df[column].values.flags.writeable = False
+        except (AttributeError, ValueError):
+            # Extension arrays (e.g. tz-aware datetimes) do not expose numpy flags
+            pass
+    return df
+
+
 class DataAnalystAgent(Agent):
-    def __init__(self, name, mt5_collector):
+    def __init__(self, name, mt5_collector, cache_dir=".cache/mt5", econ_cache_duration=900,
+                 dead_key_ttl=300, executor=None):
         super().__init__(name)
         self.mt5_collector = mt5_collector
+        # Executor for execute_async's blocking calls; None uses the event loop's default
+        self._executor = executor
         self.economic_calendar_collector = EconomicCalendarCollector()
+        
+        # In-memory TTL cache for the economic calendar (page changes at most hourly)
+        self._econ_cache = None
+        self._econ_cache_time = 0
+        self._econ_cache_duration = econ_cache_duration
+        
+        # Two-level historical bar cache: in-memory dict backed by files on disk.
+        # The directory is only created on the first write.
+        self._cache_dir = Path(cache_dir)
+        self._bar_cache = {}
+        
+        # Negative cache: (symbol, timeframe) -> expiry time for combos that returned no data
+        self._dead_keys = {}
+        self._dead_key_ttl = dead_key_ttl
+        
+        # Abort a fetch round after this many consecutive failures
+        self._max_failure_streak = 5
+        
+        # Task source -> handler
+        self._handlers = {
+            'mt5': self._exec_mt5,
+            'economic_calendar': self._exec_econ,
+        }
+
+    def _cache_path(self, symbol, timeframe):
+        """Returns the on-disk cache file for a (symbol, timeframe) pair."""
+        extension = "parquet" if _PARQUET_AVAILABLE else "pkl"
+        return self._cache_dir / f"{symbol}_{timeframe}.{extension}"
+
+    def _load_cached_bars(self, symbol, timeframe):
+        """Loads cached bars from memory, falling back to disk."""
+        key = (symbol, timeframe)
+        if key in self._bar_cache:
+            return self._bar_cache[key]
+        
+        path = self._cache_path(symbol, timeframe)
+        if not path.exists():
+            return None
+        try:
+            df = pd.read_parquet(path, engine='pyarrow') if _PARQUET_AVAILABLE else pd.read_pickle(path)
+            self._bar_cache[key] = _mark_read_only(df)
+            return df
+        except Exception as e:
+            logger.error("Error loading bar cache for %s on timeframe %s: %s", symbol, timeframe, e)
+            return None
+
+    def _save_cached_bars(self, symbol, timeframe, df):
+        """Stores bars in memory and writes them to disk atomically."""
+        self._bar_cache[(symbol, timeframe)] = _mark_read_only(df)
+        path = self._cache_path(symbol, timeframe)
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if _PARQUET_AVAILABLE:
+                df.to_parquet(tmp_path, engine='pyarrow', compression='zstd',
+                              row_group_size=1024, index=False)
+            else:
+                df.to_pickle(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error("Error saving bar cache for %s on timeframe %s: %s", symbol, timeframe, e)
+
+    def _get_bars(self, symbol, timeframe, num_bars):
+        """
+        Returns bars for (symbol, timeframe), skipping MT5 entirely for combos that
+        recently returned no data. Dead entries expire after dead_key_ttl seconds so
+        transient outages recover on their own.
+        """
+        if self._is_dead(symbol, timeframe):
+            return None
+        
+        df = self._fetch_bars(symbol, timeframe, num_bars)
+        if df is None or df.empty:
+            self._dead_keys[(symbol, timeframe)] = time.time() + self._dead_key_ttl
+        return df
+
+    def _is_dead(self, symbol, timeframe):
+        """True while (symbol, timeframe) is in the negative cache; expired entries are dropped."""
+        key = (symbol, timeframe)
+        expiry = self._dead_keys.get(key)
+        if expiry is None:
+            return False
+        if time.time() < expiry:
+            return True
+        self._dead_keys.pop(key, None)
+        return False
+
+    def _fetch_bars(self, symbol, timeframe, num_bars):
+        """
+        Returns the latest num_bars bars, downloading only the bars since the last cached
+        one. Falls back to a full download when the cache is empty, too short, older
+        than num_bars bars, does not overlap with the freshly fetched bars, or the delta
+        request fails. An empty delta (no new bar yet) returns the cached window.
+        """
+        cached_df = self._load_cached_bars(symbol, timeframe)
+        
+        if cached_df is not None and len(cached_df) >= num_bars:
+            # Estimate the gap since the last cached bar; a stale cache is cheaper to replace
+            last_time = cached_df['time'].iloc[-1]
+            elapsed = time.time() - last_time.timestamp()
+            gap_bars = int(elapsed // _timeframe_seconds(timeframe))
+            
+            if gap_bars < num_bars:
+                new_df = _downcast(self.mt5_collector.get_historical_since(symbol, timeframe, last_time))
+                if new_df is not None and new_df.empty:
+                    # No bars since the last cached one: the cached window is still current
+                    return cached_df.tail(num_bars).reset_index(drop=True)
+                # None means the delta request failed; fall through to a full download
+            else:
+                new_df = None
+            
+            # The cached window is only reusable if the new bars overlap it
+            if new_df is not None and new_df['time'].iloc[0] <= last_time:
+                merged = (
+                    pd.concat([cached_df, new_df])
+                    .drop_duplicates(subset='time', keep='last')
+                    .sort_values('time')
+                    .tail(num_bars)
+                    .reset_index(drop=True)
+                )
+                self._save_cached_bars(symbol, timeframe, merged)
+                return merged
+        
+        df = _downcast(self.mt5_collector.get_historical_data(symbol, timeframe, num_bars))
+        if df is not None and not df.empty:
+            self._save_cached_bars(symbol, timeframe, df)
+        return df
+
+    def _is_terminal_failure(self, failure_streak):
+        """True when MT5 reports a connection-level error or failures keep piling up."""
+        if failure_streak >= self._max_failure_streak:
+            return True
+        code, _ = self.mt5_collector.last_error()
+        return code in TERMINAL_MT5_ERRORS
+
+    def _max_concurrent(self):
+        """Upper bound on parallel MT5 fetches, taken from the collector's rate limit settings."""
+        return getattr(self.mt5_collector, 'max_concurrent', None) or 16
+
+    @staticmethod
+    def _bars_resolver(num_bars):
+        """
+        Returns a callable mapping a timeframe to its bar count, resolving once whether
+        num_bars is a per-timeframe dict or a single value.
+        """
+        if isinstance(num_bars, Mapping):
+            return lambda timeframe: num_bars.get(timeframe, 100)
+        return lambda timeframe: num_bars
+
+    def execute_batch(self, tasks, max_workers=16):
+        """
+        Fetches several MT5 tasks at once. All (symbol, timeframe) jobs share one MT5
+        session and one thread pool. Returns {symbol: {timeframe: df}}; a symbol maps to
+        None when none of its timeframes returned data, matching execute().
+        """
+        jobs = [
+            (task['symbol'], timeframe, nbars_of(timeframe))
+            for task in tasks if task.get('source') == 'mt5'
+            for nbars_of in (self._bars_resolver(task['num_bars']),)
+            for timeframe in task['timeframes']
+        ]
+        results = {task['symbol']: {} for task in tasks if task.get('source') == 'mt5'}
+        
+        # Known-dead combos are resolved up front so they never count as fetch failures
+        live_jobs = []
+        for symbol, timeframe, num_bars in jobs:
+            if self._is_dead(symbol, timeframe):
+                results[symbol][timeframe] = None
+            else:
+                live_jobs.append((symbol, timeframe, num_bars))
+        jobs = live_jobs
+        if not jobs:
+            return {symbol: (data if any(df is not None for df in data.values()) else None)
+                    for symbol, data in results.items()}
+        
+        with self.mt5_collector.session() as connected:
+            if not connected:
+                logger.error("Failed to connect to MT5 for batch of %d symbols", len(results))
+                return {symbol: None for symbol in results}
+            
+            workers = min(max_workers, self._max_concurrent(), len(jobs))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(self._get_bars, symbol, timeframe, num_bars): (symbol, timeframe)
+                    for symbol, timeframe, num_bars in jobs
+                }
+                
+                failure_streak = 0
+                for future in as_completed(futures):
+                    symbol, timeframe = futures[future]
+                    try:
+                        df = future.result()
+                        if df is not None and not df.empty:
+                            results[symbol][timeframe] = df
+                            failure_streak = 0
+                            continue
+                        logger.warning("No data received for %s on timeframe %s", symbol, timeframe)
+                    except Exception as e:
+                        logger.error("Error fetching data for %s on timeframe %s: %s", symbol, timeframe, e)
+                    
+                    results[symbol][timeframe] = None
+                    failure_streak += 1
+                    if self._is_terminal_failure(failure_streak):
+                        logger.error("Aborting batch fetch: MT5 unavailable (%s)", self.mt5_collector.last_error())
+                        for pending in futures:
+                            pending.cancel()
+                        return {symbol: None for symbol in results}
+        
+        for symbol, data in results.items():
+            if not any(df is not None for df in data.values()):
+                logger.warning("Failed to get any data for symbol %s", symbol)
+                results[symbol] = None
+        return results
+
+    def _get_economic_calendar(self):
+        """Returns the economic calendar, reusing the last result within the TTL window."""
+        current_time = time.time()
+        if self._econ_cache is not None and (current_time - self._econ_cache_time) < self._econ_cache_duration:
+            return self._econ_cache
+        
+        calendar = self.economic_calendar_collector.get_economic_calendar()
+        if calendar is not None and not calendar.empty:
+            self._econ_cache = calendar
+            self._econ_cache_time = current_time
+        return calendar
 
     def execute(self, task):
         """
         Executes a data collection task.
+        
+        MT5 DataFrames are shared with the bar cache and must be treated as read-only:
+        derive new frames with df.assign(...) or take an explicit df.copy() before
+        mutating them.
         """
-        if task['source'] == 'mt5':
-            # Ensure MT5 connection is established
-            if not self.mt5_collector.connect():
-                print(f"Failed to connect to MT5 for symbol {task.get('symbol', 'unknown')}")
+        return self._handlers.get(task['source'], self._exec_default)(task)
+
+    def _exec_mt5(self, task):
+        """Fetches all requested timeframes for one symbol from MT5."""
+        # Reuses the caller's MT5 session when one is already open
+        with self.mt5_collector.session() as connected:
+            if not connected:
+                logger.error("Failed to connect to MT5 for symbol %s", task.get('symbol', 'unknown'))
                 return None
-            
+
             data = {}
             success_count = 0
             total_timeframes = len(task['timeframes'])
-            
-            for timeframe in task['timeframes']:
-                try:
-                    # Handle different formats of num_bars
-                    if isinstance(task['num_bars'], dict):
-                        num_bars = task['num_bars'].get(timeframe, 100)
-                    else:
-                        num_bars = task['num_bars']
-                    
-                    df = self.mt5_collector.get_historical_data(
-                        task['symbol'], timeframe, num_bars
-                    )
+            nbars_of = self._bars_resolver(task['num_bars'])
+
+            # Fetch all timeframes concurrently; the MT5 client releases the GIL during IPC
+            with ThreadPoolExecutor(max_workers=max(1, min(total_timeframes, self._max_concurrent()))) as executor:
+                futures = {
+                    executor.submit(
+                        self._get_bars,
+                        task['symbol'], timeframe, nbars_of(timeframe)
+                    ): timeframe
+                    for timeframe in task['timeframes']
+                }
+
+                failure_streak = 0
+                for future in as_completed(futures):
+                    timeframe = futures[future]
+                    try:
+                        df = future.result()
+
+                        if df is not None and not df.empty:
+                            data[timeframe] = df
+                            success_count += 1
+                            failure_streak = 0
+                            continue
+                        logger.warning("No data received for %s on timeframe %s", task['symbol'], timeframe)
+
+                    except Exception as e:
+                        logger.error("Error fetching data for %s on timeframe %s: %s", task['symbol'], timeframe, e)
                     
-                    if df is not None and not df.empty:
-                        data[timeframe] = df
-                        success_count += 1
-                    else:
-                        print(f"No data received for {task['symbol']} on timeframe {timeframe}")
-                        data[timeframe] = None
-                        
-                except Exception as e:
-                    print(f"Error fetching data for {task['symbol']} on timeframe {timeframe}: {e}")
                     data[timeframe] = None
+                    failure_streak += 1
+                    if self._is_terminal_failure(failure_streak):
+                        logger.error("Aborting fetch for %s: MT5 unavailable (%s)",
+                                     task['symbol'], self.mt5_collector.last_error())
+                        for pending in futures:
+                            pending.cancel()
+                        return None
+
+        # Return data only if we got at least some successful results
+        if success_count > 0:
+            return data
+        else:
+            logger.warning("Failed to get any data for symbol %s", task['symbol'])
+            return None
+
+    async def execute_async(self, task):
+        """
+        Async variant of execute() so an orchestrator can asyncio.gather() many tasks.
+        MT5 calls are blocking, so each timeframe fetch runs in a worker thread of the
+        agent's executor (the loop's default one if none was given).
+        """
+        loop = asyncio.get_running_loop()
+        if task['source'] != 'mt5':
+            return await loop.run_in_executor(self._executor, self.execute, task)
+        
+        symbol = task['symbol']
+        # hold()/release() may block on connect/shutdown, so keep them off the event loop
+        connected = await loop.run_in_executor(self._executor, self.mt5_collector.hold)
+        try:
+            if not connected:
+                logger.error("Failed to connect to MT5 for symbol %s", symbol)
+                return None
             
-            # Disconnect after data collection
-            self.mt5_collector.disconnect()
+            nbars_of = self._bars_resolver(task['num_bars'])
+            pending = {
+                loop.run_in_executor(self._executor, self._get_bars, symbol, timeframe, nbars_of(timeframe)): timeframe
+                for timeframe in task['timeframes']
+            }
             
-            # Return data only if we got at least some successful results
-            if success_count > 0:
-                return data
-            else:
-                print(f"Failed to get any data for symbol {task['symbol']}")
-                return None
-                
-        elif task['source'] == 'economic_calendar':
-            return self.economic_calendar_collector.get_economic_calendar()
+            data = {}
+            failure_streak = 0
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    timeframe = pending.pop(future)
+                    try:
+                        df = future.result()
+                        if df is not None and not df.empty:
+                            data[timeframe] = df
+                            failure_streak = 0
+                            continue
+                        logger.warning("No data received for %s on timeframe %s", symbol, timeframe)
+                    except Exception as e:
+                        logger.error("Error fetching data for %s on timeframe %s: %s", symbol, timeframe, e)
+                    
+                    data[timeframe] = None
+                    failure_streak += 1
+                    if self._is_terminal_failure(failure_streak):
+                        logger.error("Aborting fetch for %s: MT5 unavailable (%s)",
+                                     symbol, self.mt5_collector.last_error())
+                        for other in pending:
+                            other.cancel()
+                        return None
+        finally:
+            await loop.run_in_executor(self._executor, self.mt5_collector.release)
+        
+        if any(df is not None for df in data.values()):
+            return data
+        logger.warning("Failed to get any data for symbol %s", symbol)
+        return None
+
+    async def aexecute(self, task):
+        """Agent-level async entry point; MT5 tasks fan out per timeframe via execute_async()."""
+        return await self.execute_async(task)
+
+    def _exec_econ(self, task):
+        """Returns the (TTL-cached) economic calendar."""
+        return self._get_economic_calendar()
+
+    def _exec_default(self, task):
+        """Fallback for unknown sources."""
         return pd.DataFrame()
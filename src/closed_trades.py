@@ -0,0 +1,53 @@
+"""
+Closed-trade bookkeeping shared by the live trader and the full-day simulation,
+plus the money formatters their summaries use.
+"""
+from array import array
+
+import numpy as np
+import pandas as pd
+
+# Money formatters for the summary logs, bound once instead of re-parsing the spec per call
+fmt_signed = "{:+,.2f}".format
+fmt_unsigned = "{:,.2f}".format
+
+
+class ClosedTradeStore:
+    """
+    Closed trades as columns (P&L as a flat float64 array) with running totals, so
+    summaries never rescan the history.
+    """
+
+    def __init__(self):
+        self._pnl = array('d')
+        self._columns = {'symbol': [], 'entry_time': [], 'exit_time': []}
+        self._df = None
+        self.total_pnl = 0.0
+        self.winners = 0
+
+    def __len__(self):
+        return len(self._pnl)
+
+    def record(self, position):
+        """Appends one closed position to the columns and the running totals."""
+        pnl = position.get('pnl', 0.0)
+        self._pnl.append(pnl)
+        columns = self._columns
+        columns['symbol'].append(position.get('symbol'))
+        columns['entry_time'].append(position.get('timestamp'))
+        columns['exit_time'].append(position.get('last_update'))
+        self._df = None
+        self.total_pnl += pnl
+        self.winners += pnl > 0
+
+    def to_df(self):
+        """
+        Closed trades as a DataFrame (pnl, symbol, entry_time, exit_time), reused
+        until the next trade is recorded.
+        """
+        if self._df is None:
+            self._df = pd.DataFrame({
+                'pnl': np.frombuffer(self._pnl, dtype=np.float64) if self._pnl else np.empty(0),
+                **self._columns,
+            })
+        return self._df
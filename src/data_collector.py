@@ -1,11 +1,19 @@
+import contextlib
+import threading
+import time
 import pandas as pd
 try:
     import MetaTrader5 as mt5
 except ImportError:
     from . import mock_metatrader5 as mt5
 
+# MT5 error codes meaning the terminal link itself is down (auth failure, IPC
+# send/receive/init/connect/timeout), as opposed to a per-symbol data problem
+TERMINAL_MT5_ERRORS = frozenset({-6, -10001, -10002, -10003, -10004, -10005})
+
+
 class MT5DataCollector:
-    def __init__(self, login, password, server, path):
+    def __init__(self, login, password, server, path, rate_limit_per_second=30, max_concurrent=None):
         self.login = int(login)
         self.password = password
         self.server = server
@@ -13,54 +21,179 @@ class MT5DataCollector:
         self.is_connected = False
         self.connection_retries = 0
         self.max_retries = 3
+        self._session_depth = 0
+        # Guards the connect/refcount state; sessions are opened from worker threads too
+        self._session_lock = threading.RLock()
+        
+        # Token bucket pacing bar requests so parallel fetches stay under broker limits
+        self.rate_limit_per_second = rate_limit_per_second
+        self.max_concurrent = max_concurrent or rate_limit_per_second
+        self._rate_tokens = float(rate_limit_per_second)
+        self._rate_last_refill = time.monotonic()
+        self._rate_lock = threading.Lock()
+
+    def _acquire_rate_token(self):
+        """Blocks until a request token is available (token bucket, refilled continuously)."""
+        with self._rate_lock:
+            now = time.monotonic()
+            self._rate_tokens = min(
+                self.rate_limit_per_second,
+                self._rate_tokens + (now - self._rate_last_refill) * self.rate_limit_per_second
+            )
+            self._rate_last_refill = now
+            # Reserve a token now; a negative balance is the queue of waiting callers
+            self._rate_tokens -= 1
+            wait = -self._rate_tokens / self.rate_limit_per_second if self._rate_tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
 
     def connect(self):
         """Connects to the MetaTrader 5 terminal with retry logic."""
-        if self.is_connected and mt5.terminal_info() is not None:
-            return True
+        with self._session_lock:
+            if self.is_connected and mt5.terminal_info() is not None:
+                return True
             
-        for attempt in range(self.max_retries):
-            try:
-                # Ensure clean state
-                mt5.shutdown()
+            for attempt in range(self.max_retries):
+                try:
+                    # Ensure clean state
+                    mt5.shutdown()
                 
-                # Attempt connection
-                if mt5.initialize(path=self.path, login=self.login, password=self.password, server=self.server):
-                    self.is_connected = True
-                    self.connection_retries = 0
-                    print("MT5 initialized successfully.")
-                    return True
-                else:
-                    error = mt5.last_error()
-                    print(f"MT5 connection attempt {attempt + 1} failed: {error}")
-                    if attempt < self.max_retries - 1:
-                        import time
-                        time.sleep(2 ** attempt)  # Exponential backoff
-            except Exception as e:
-                print(f"Exception during MT5 connection attempt {attempt + 1}: {e}")
+                    # Attempt connection
+                    if mt5.initialize(path=self.path, login=self.login, password=self.password, server=self.server):
+                        self.is_connected = True
+                        self.connection_retries = 0
+                        print("MT5 initialized successfully.")
+                        return True
+                    else:
+                        error = mt5.last_error()
+                        print(f"MT5 connection attempt {attempt + 1} failed: {error}")
+                        if attempt < self.max_retries - 1:
+                            import time
+                            time.sleep(2 ** attempt)  # Exponential backoff
+                except Exception as e:
+                    print(f"Exception during MT5 connection attempt {attempt + 1}: {e}")
                 
-        self.is_connected = False
-        print(f"Failed to establish MT5 connection after {self.max_retries} attempts")
-        return False
+            self.is_connected = False
+            print(f"Failed to establish MT5 connection after {self.max_retries} attempts")
+            return False
 
     def disconnect(self):
         """Shuts down the connection to the MetaTrader 5 terminal."""
-        if self.is_connected:
-            mt5.shutdown()
+        with self._session_lock:
+            # Keep the terminal open while a session() block holds the connection
+            if self._session_depth > 0:
+                return
+            if self.is_connected:
+                mt5.shutdown()
+                self.is_connected = False
+                print("MT5 connection shut down.")
+
+    def last_error(self):
+        """Returns the last MT5 error as a (code, description) tuple."""
+        error = mt5.last_error()
+        if isinstance(error, tuple) and len(error) == 2:
+            return error
+        return None, str(error)
+
+    def ping(self):
+        """Cheap liveness check against the terminal; returns whether it still answers."""
+        if mt5.terminal_info() is not None:
+            return True
+        self.is_connected = False
+        return False
+
+    def reconnect(self):
+        """Drops the current terminal link and connects again (with connect()'s retries)."""
+        with self._session_lock:
             self.is_connected = False
-            print("MT5 connection shut down.")
+            return self.connect()
 
-    def get_historical_data(self, symbol, timeframe, num_bars=1000):
-        """Gets historical bar data for a given symbol and timeframe."""
+    def account_info(self):
+        """
+        mt5.account_info() for callers outside the main loop's thread. Serialized with
+        connect/reconnect/disconnect and paced by the rate limiter; None while disconnected.
+        """
+        self._acquire_rate_token()
+        with self._session_lock:
+            if not self.is_connected:
+                return None
+            return mt5.account_info()
+
+    def hold(self):
+        """
+        Connects (or reuses the open connection) and defers disconnect() calls until
+        the matching release(). Returns whether the connection succeeded.
+        """
+        with self._session_lock:
+            connected = self.connect() if self._session_depth == 0 else self.is_connected
+            self._session_depth += 1
+        return connected
+
+    def release(self):
+        """Ends a hold(); the last release shuts the connection down."""
+        with self._session_lock:
+            self._session_depth -= 1
+            if self._session_depth == 0:
+                self.disconnect()
+
+    @contextlib.contextmanager
+    def session(self):
+        """
+        Holds the MT5 connection open for the duration of the block and yields whether
+        the connection succeeded. Nested sessions reuse the outer connection, and
+        disconnect() calls inside the block are deferred until the outermost exit.
+        """
+        connected = self.hold()
+        try:
+            yield connected
+        finally:
+            self.release()
+
+    def get_historical_array(self, symbol, timeframe, num_bars=1000):
+        """
+        Gets historical bars as the raw NumPy structured array returned by MT5
+        (fields: time, open, high, low, close, tick_volume, spread, real_volume).
+        Use this for NumPy-only consumers to skip DataFrame construction.
+        """
+        self._acquire_rate_token()
         rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, num_bars)
         if rates is None:
             print(f"Failed to get rates for {symbol}: {mt5.last_error()}")
             return None
+        return rates
 
-        rates_df = pd.DataFrame(rates)
+    @staticmethod
+    def to_df(rates):
+        """Wraps an MT5 rates array in a DataFrame with 'time' converted to datetime."""
+        rates_df = pd.DataFrame.from_records(rates)
         rates_df['time'] = pd.to_datetime(rates_df['time'], unit='s')
         return rates_df
 
+    def get_historical_data(self, symbol, timeframe, num_bars=1000):
+        """Gets historical bar data for a given symbol and timeframe."""
+        rates = self.get_historical_array(symbol, timeframe, num_bars)
+        if rates is None:
+            return None
+        return self.to_df(rates)
+
+    def get_historical_since(self, symbol, timeframe, last_time):
+        """
+        Gets the bars from last_time (inclusive, so the still-forming bar is refreshed)
+        up to the latest bar. Used for incremental updates of cached bar windows.
+        """
+        import datetime
+        
+        date_from = pd.Timestamp(last_time).to_pydatetime().replace(tzinfo=datetime.timezone.utc)
+        # Bar times are broker server time, which may run ahead of UTC
+        date_to = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=1)
+        
+        self._acquire_rate_token()
+        rates = mt5.copy_rates_range(symbol, timeframe, date_from, date_to)
+        if rates is None:
+            print(f"Failed to get rates since {last_time} for {symbol}: {mt5.last_error()}")
+            return None
+        return self.to_df(rates)
+
     def get_live_data(self, symbol, timeframe, prev_time=None):
         """
         Gets the latest bar data for live trading simulation.
@@ -1,11 +1,15 @@
 import numpy as np
 import pandas as pd
+import pytz
 from datetime import datetime, timedelta
 try:
     import MetaTrader5 as mt5
 except ImportError:
     pass
 
+# Session reference timezone, resolved once instead of on every multiplier lookup
+_LONDON_TZ = pytz.timezone('Europe/London')
+
 class DynamicReinforcementEngine:
     """
     Event-driven reinforcement engine that responds to market changes in real-time
@@ -127,6 +131,85 @@ class DynamicReinforcementEngine:
         
         return events
     
+    def detect_market_events_batch(self, positions, current_market_data, ufo_data=None, market_arrays=None):
+        """
+        detect_market_events over a whole list of positions in one call.
+        
+        Price-movement and rapid-loss triggers are evaluated on arrays across
+        all positions. UFO signal changes are detected once and paired with
+        every position, as the per-position calls did. market_arrays is an
+        optional structure-of-arrays view of the market data ('index' symbol -> row
+        map plus a 'close' array); current prices are then gathered from it.
+        
+        Returns:
+            List of (position_index, event) tuples
+        """
+        pairs = []
+        
+        if not positions or not current_market_data:
+            return pairs
+        
+        n = len(positions)
+        symbols = [position.get('symbol', '') for position in positions]
+        known = np.fromiter((symbol in current_market_data for symbol in symbols), dtype=bool, count=n)
+        entry_prices = np.fromiter(
+            (position.get('entry_price', position.get('price_open', 0)) for position in positions),
+            dtype=np.float64, count=n
+        )
+        if market_arrays is not None and len(market_arrays['close']):
+            index = market_arrays['index']
+            rows = np.fromiter((index.get(symbol, -1) for symbol in symbols), dtype=np.int64, count=n)
+            known &= rows >= 0
+            current_prices = np.where(known, market_arrays['close'][rows], 0.0)
+        else:
+            current_prices = np.fromiter(
+                (current_market_data[symbol].get('close', 0) if is_known else 0.0
+                 for symbol, is_known in zip(symbols, known)),
+                dtype=np.float64, count=n
+            )
+        pip_multipliers = np.fromiter(
+            (100.0 if 'JPY' in symbol else 10000.0 for symbol in symbols), dtype=np.float64, count=n
+        )
+        pnls = np.fromiter(
+            (position.get('pnl', position.get('profit', 0)) for position in positions),
+            dtype=np.float64, count=n
+        )
+        
+        movement_pips = np.abs(current_prices - entry_prices) * pip_multipliers
+        initial_balance = 10000  # Could be made configurable
+        loss_pct = np.abs(pnls) / initial_balance * 100
+        moved = known & (entry_prices > 0) & (movement_pips >= self.price_movement_trigger_pips)
+        losing = known & (pnls < 0) & (loss_pct >= self.rapid_loss_threshold_pct)
+        
+        ufo_changes = []
+        if ufo_data and hasattr(self, 'previous_ufo_data'):
+            ufo_changes = self._detect_ufo_signal_changes(ufo_data, self.previous_ufo_data)
+        
+        high_movement = self.price_movement_trigger_pips * 2
+        for idx in range(n):
+            position = positions[idx]
+            if moved[idx]:
+                pips = float(movement_pips[idx])
+                pairs.append((idx, {
+                    'type': 'price_movement',
+                    'symbol': symbols[idx],
+                    'movement_pips': pips,
+                    'position': position,
+                    'priority': 'high' if pips > high_movement else 'medium'
+                }))
+            if losing[idx]:
+                pairs.append((idx, {
+                    'type': 'rapid_loss',
+                    'symbol': symbols[idx],
+                    'loss_pct': float(loss_pct[idx]),
+                    'position': position,
+                    'priority': 'critical'
+                }))
+            for change in ufo_changes:
+                pairs.append((idx, change))
+        
+        return pairs
+    
     def _detect_ufo_signal_changes(self, current_ufo, previous_ufo):
         """Detect significant changes in UFO signals"""
         changes = []
@@ -224,12 +307,7 @@ class DynamicReinforcementEngine:
     def _get_session_multiplier(self):
         """Get current session multiplier"""
         try:
-            from datetime import datetime
-            import pytz
-            
-            utc_now = datetime.utcnow().replace(tzinfo=pytz.UTC)
-            london_time = utc_now.astimezone(pytz.timezone('Europe/London'))
-            hour = london_time.hour
+            hour = datetime.now(_LONDON_TZ).hour
             
             # Determine current session
             if 23 <= hour or hour < 8:  # Asian session
@@ -295,6 +373,17 @@ class DynamicReinforcementEngine:
         
         self.last_reinforcement_check = datetime.now()
     
+    def can_reinforce_any(self, positions):
+        """True if at least one of the positions is still below its reinforcement cap"""
+        if not self.enabled:
+            return False
+        history = self.position_reinforcement_history
+        cap = self.max_reinforcements_per_position
+        return any(
+            history.get(position.get('ticket', position.get('id')), {}).get('count', 0) < cap
+            for position in positions
+        )
+    
     def get_reinforcement_status(self, position):
         """Get reinforcement status for a position"""
         position_id = position.get('ticket', position.get('id', str(hash(str(position)))))
@@ -1,9 +1,15 @@
+import asyncio
+import atexit
 import time
+import numpy as np
 import pandas as pd
-import re
-import json
 import logging
-from datetime import datetime, timedelta
+import random
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from types import MappingProxyType
 try:
     import MetaTrader5 as mt5
 except ImportError:
@@ -16,11 +22,54 @@ from .agents.risk_manager_agent import RiskManagerAgent
 from .agents.fund_manager_agent import FundManagerAgent
 from .ufo_calculator import UfoCalculator
 from .llm.llm_client import LLMClient
+from .llm.json_utils import parse_llm_json
 from .trade_executor import TradeExecutor
+from .closed_trades import ClosedTradeStore, fmt_signed, fmt_unsigned
 from .ufo_trading_engine import UFOTradingEngine
 from .dynamic_reinforcement_engine import DynamicReinforcementEngine
+from ._ufo_jit import warm_up as warm_up_ufo_kernels
+from ._ufo_jit import (
+    reinforcement_kind, reinforcement_entry_price, strength_entry_adjustment, bound_entry_price
+)
+
+# Per-symbol constants resolved once: currencies, pip size, suffix-free name, JPY flag,
+# quote digits and the spread assumed when only a bar (no tick) is available
+SymbolMeta = namedtuple(
+    'SymbolMeta', ['base', 'quote', 'pip_size', 'clean_symbol', 'is_jpy', 'digits', 'default_spread']
+)
+
+# Errors that can only come from our own code; the loop re-raises these. AttributeError
+# and TypeError are not included: MT5 calls return None on a terminal hiccup and the
+# following attribute access fails the same way, which must stay recoverable.
+_PROGRAMMER_ERRORS = (NameError,)
+# Main-loop retry delay bounds (seconds) for recoverable failures
+_LOOP_BACKOFF_MIN = 1.0
+_LOOP_BACKOFF_MAX = 60.0
+# Shortest main-loop sleep (seconds), so a cycle that stays overdue cannot busy-spin
+_LOOP_MIN_SLEEP = 1.0
+
+# Lazy %-style template for the per-opportunity reinforcement record (formatted only if emitted)
+_REINFORCEMENT_FMT = "\n🎯 Executing %s reinforcement:\n   Position: %s #%s\n   Reason: %s"
+
+
+def _market_arrays(market_data):
+    """
+    Structure-of-arrays view of a {symbol: quote} market-data dict: a symbol -> row
+    'index' map plus parallel float64 'bid'/'ask'/'spread'/'close' arrays.
+    """
+    symbols = tuple(market_data)
+    n = len(symbols)
+    quotes = market_data.values()
+    arrays = {'symbol': symbols, 'index': {symbol: i for i, symbol in enumerate(symbols)}}
+    for field in ('bid', 'ask', 'spread', 'close'):
+        arrays[field] = np.fromiter((quote[field] for quote in quotes), dtype=np.float64, count=n)
+    return arrays
 
 class LiveTrader:
+    # Direction name and MT5 order type indexed by the MT5 position type (0=BUY, 1=SELL)
+    _DIR = ('BUY', 'SELL')
+    _OTYPE = (mt5.ORDER_TYPE_BUY, mt5.ORDER_TYPE_SELL)
+
     def __init__(self, config):
         self.config = config
         self._setup_logging()
@@ -45,11 +94,32 @@ class LiveTrader:
             self.config['trading'].get('position_update_frequency_minutes', '5'), 5
         )
         self.position_update_frequency_seconds = self.position_update_frequency_minutes * 60
+        # Monotonic time before which a non-forced monitoring pass is skipped
+        self._next_monitor_deadline = 0.0
         
         # Check if continuous monitoring is enabled in config
         continuous_monitoring_str = self.config['trading'].get('continuous_monitoring_enabled', 'true').lower()
         self.continuous_monitoring_enabled = continuous_monitoring_str in ['true', 'yes', '1', 'enabled']
         
+        # Equity watcher: between scheduled checks, a background thread polls equity every
+        # equity_watch_seconds and wakes the main loop when it moves by more than
+        # rapid_change_threshold_pct, so monitoring reacts without waiting out the sleep
+        self.equity_watch_seconds = parse_config_value(self.config['trading'].get('equity_watch_seconds', '5'), 5)
+        self.rapid_change_threshold_pct = parse_config_value(
+            self.config['trading'].get('rapid_change_threshold_pct', '1.0'), 1.0
+        )
+        self._rapid_change_threshold_sq = self.rapid_change_threshold_pct * self.rapid_change_threshold_pct
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        
+        # MT5 keep-alive: the terminal connection stays open across cycles and is
+        # health-checked every mt5_keepalive_seconds (sooner, with backoff, after a failure)
+        self.mt5_keepalive_seconds = parse_config_value(self.config['mt5'].get('keepalive_seconds', '60'), 60)
+        self._mt5_connected = False
+        self._mt5_held = False
+        self._last_mt5_ping = 0.0
+        self._mt5_reconnect_failures = 0
+        
         self.llm_client = LLMClient(api_key=config['openrouter']['api_key'])
 
         self.mt5_collector = MT5DataCollector(
@@ -62,8 +132,15 @@ class LiveTrader:
         self.trade_executor = TradeExecutor(self.mt5_collector, self.config)
         self.ufo_engine = UFOTradingEngine(config)
 
+        # Worker threads for blocking MT5 calls, shared by every cycle instead of being
+        # spawned per fetch: symbol x timeframe bar downloads and per-position quotes
+        self._io_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="mt5-io")
+
         self.agents = {
-            "data_analyst": DataAnalystAgent("DataAnalyst", self.mt5_collector),
+            "data_analyst": DataAnalystAgent(
+                "DataAnalyst", self.mt5_collector,
+                cache_dir=config['mt5'].get('bar_cache_dir', '.cache/mt5'), executor=self._io_pool
+            ),
             "researcher": MarketResearcherAgent("MarketResearcher", self.llm_client),
             "trader": TraderAgent("Trader", self.llm_client, self.mt5_collector),
             "risk_manager": RiskManagerAgent("RiskManager", self.llm_client, self.mt5_collector, self.config),
@@ -71,6 +148,8 @@ class LiveTrader:
         }
 
         self.ufo_calculator = UfoCalculator(config['trading']['currencies'].split(','))
+        # Compile (or load cached) numba kernels now rather than in the first cycle
+        warm_up_ufo_kernels()
 
         # Initialize Dynamic Reinforcement Engine
         self.dynamic_reinforcement_engine = DynamicReinforcementEngine(config)
@@ -81,12 +160,55 @@ class LiveTrader:
 
         # Portfolio tracking attributes
         self.open_positions = []
+        # Current P&L, peak P&L and open time (epoch seconds) per open position as
+        # parallel arrays, aligned with open_positions via ticket -> index
+        self._ticket_to_idx = {}
+        self._pnl = np.empty(0, dtype=np.float64)
+        self._peaks = np.empty(0, dtype=np.float64)
+        self._open_ts = np.empty(0, dtype=np.int64)
         self.closed_trades = []
+        self._closed = ClosedTradeStore()
         self.realized_pnl = 0.0
+        self._unrealized_pnl = 0.0
         self.portfolio_value = 0.0
         self.initial_balance = 0.0
         self.last_cycle_time = 0
         self.cycle_count = 0  # Add cycle counter like simulation
+        # Cycle summaries are emitted at most once per summary_interval_s
+        self.summary_interval_s = 1.0
+        self._last_summary_ts = 0.0
+        
+        # Short-lived MT5 read caches: (monotonic timestamp, value)
+        self._account_cache = (0.0, None)
+        self._tick_cache = {}
+        self._symbol_meta = {}
+        # Symbols already enabled in the terminal's Market Watch
+        self._selected_symbols = set()
+        # Last per-position market data pass: (monotonic timestamp, symbols, data)
+        self._market_snapshot = (0.0, frozenset(), {})
+        self.market_snapshot_ttl = 1.0
+        # Broker positions frame, reused until a trade or close invalidates it
+        self._positions_df = None
+        # Latest strength per (timeframe, currency) for the current UFO snapshot
+        self._ufo_strength_index = {}
+        self._ufo_indexed_snapshot = None
+        # Reinforcement budget: at most max_reinforcements_per_cycle executions per
+        # rolling minute, tracked as [window start (monotonic), executed count]
+        self.max_reinforcements_per_cycle = 3
+        self._reinforcement_budget = [0.0, 0]
+        
+        # Symbol universe and bar windows are fixed for the session; resolve them once
+        self._symbol_suffix = self.config['mt5'].get('symbol_suffix', '')
+        self._symbols = tuple(self.config['trading']['symbols'].split(','))
+        self._symbols_suffixed = tuple(symbol + self._symbol_suffix for symbol in self._symbols)
+        self._timeframes = (mt5.TIMEFRAME_M5, mt5.TIMEFRAME_M15, mt5.TIMEFRAME_H1, mt5.TIMEFRAME_H4, mt5.TIMEFRAME_D1)
+        self._timeframe_bars = MappingProxyType({
+            mt5.TIMEFRAME_M5: 240,
+            mt5.TIMEFRAME_M15: 80,
+            mt5.TIMEFRAME_H1: 20,
+            mt5.TIMEFRAME_H4: 120,
+            mt5.TIMEFRAME_D1: 100
+        })
         
         self._initialize_portfolio()
 
@@ -118,8 +240,13 @@ class LiveTrader:
         root_logger.addHandler(console_handler)
 
     def _initialize_portfolio(self):
-        """Initializes portfolio balance and P&L."""
-        if self.mt5_collector.connect():
+        """Initializes portfolio balance and P&L and opens the long-lived MT5 connection."""
+        self._mt5_connected = self.mt5_collector.hold()
+        self._mt5_held = True
+        # Shut the terminal link down on interpreter exit even if run() never finishes
+        atexit.register(self._release_mt5_session)
+        self._last_mt5_ping = time.monotonic()
+        if self._mt5_connected:
             account_info = mt5.account_info()
             if account_info:
                 self.initial_balance = account_info.balance
@@ -129,67 +256,244 @@ class LiveTrader:
                 logging.warning("⚠️ Could not retrieve account info. Using default values.")
                 self.initial_balance = 10000.0
                 self.portfolio_value = 10000.0
-            self.mt5_collector.disconnect()
+            for symbol in self._symbols_suffixed:
+                self._ensure_symbol_selected(symbol)
+                self._get_symbol_meta(symbol)
         else:
             logging.error("⚠️ MT5 connection failed during portfolio initialization. Using default values.")
             self.initial_balance = 10000.0
             self.portfolio_value = 10000.0
 
+    def _release_mt5_session(self):
+        """Releases the long-lived MT5 hold taken in _initialize_portfolio (idempotent)."""
+        if self._mt5_held:
+            self._mt5_held = False
+            self.mt5_collector.release()
+
+    def _check_mt5_connection(self):
+        """
+        Pings the held MT5 connection once per keep-alive interval and reconnects on
+        failure. Failed reconnects are retried after exponentially growing delays
+        (capped at the keep-alive interval) rather than blocking the loop.
+        """
+        now = time.monotonic()
+        if self._mt5_reconnect_failures:
+            interval = min(2 ** self._mt5_reconnect_failures, self.mt5_keepalive_seconds)
+        else:
+            interval = self.mt5_keepalive_seconds
+        if now - self._last_mt5_ping < interval:
+            return self._mt5_connected
+        self._last_mt5_ping = now
+
+        if self.mt5_collector.ping():
+            self._mt5_connected = True
+            self._mt5_reconnect_failures = 0
+            return True
+
+        logging.warning("⚠️ MT5 terminal not responding. Reconnecting...")
+        self._mt5_connected = self.mt5_collector.reconnect()
+        if self._mt5_connected:
+            self._mt5_reconnect_failures = 0
+            logging.info("✅ MT5 connection restored.")
+        else:
+            self._mt5_reconnect_failures += 1
+            logging.error(f"❌ MT5 reconnect failed ({self._mt5_reconnect_failures} in a row).")
+        return self._mt5_connected
+
+    def _get_symbol_meta(self, symbol):
+        """
+        Returns the SymbolMeta for a broker symbol, building it on first use. The pip size
+        comes from the broker's point/digits when available, else the JPY heuristic; the
+        default spread is one pip, or the broker's tick size if that is coarser.
+        """
+        meta = self._symbol_meta.get(symbol)
+        if meta is not None:
+            return meta
+
+        clean_symbol = symbol.replace('-ECN', '').replace('/', '')
+        if self._symbol_suffix:
+            clean_symbol = clean_symbol.replace(self._symbol_suffix, '')
+
+        is_jpy = 'JPY' in clean_symbol
+        pip_size = 0.01 if is_jpy else 0.0001
+        digits = 3 if is_jpy else 5
+        symbol_info = getattr(mt5, 'symbol_info', None)
+        info = symbol_info(symbol) if symbol_info else None
+        if info is not None and getattr(info, 'point', 0) > 0:
+            # Fractional-pip quotes (3/5 digits) have a point of a tenth of a pip
+            pip_size = info.point * 10 if info.digits in (3, 5) else info.point
+            digits = info.digits
+        tick_size = getattr(info, 'trade_tick_size', 0.0) if info is not None else 0.0
+        default_spread = max(tick_size or 0.0, pip_size)
+
+        meta = SymbolMeta(
+            clean_symbol[:3], clean_symbol[3:6], pip_size, clean_symbol, is_jpy, digits, default_spread
+        )
+        self._symbol_meta[symbol] = meta
+        return meta
+
+    def _cached_account_info(self, max_age=1.0):
+        """Returns MT5 account info, reusing the last result for up to max_age seconds."""
+        cached_at, info = self._account_cache
+        if info is not None and time.monotonic() - cached_at < max_age:
+            return info
+        # The keep-alive holds the terminal connection, so read through it directly
+        info = self.agents['risk_manager'].portfolio_manager.get_account_info()
+        self._account_cache = (time.monotonic(), info) if info else (0.0, None)
+        return info
+
+    def _invalidate_account_cache(self):
+        """Drops cached account info and positions after trades change balance/equity."""
+        self._account_cache = (0.0, None)
+        self._positions_df = None
+
+    def _get_positions_df(self, refresh=False):
+        """
+        Returns the broker positions DataFrame, fetching it only when forced or after
+        a trade has invalidated the cached frame.
+        """
+        if refresh or self._positions_df is None:
+            self._positions_df = self.agents['risk_manager'].portfolio_manager.get_positions()
+        return self._positions_df
+
+    def _ensure_symbol_selected(self, symbol):
+        """
+        Enables symbol in Market Watch once per session so its ticks stay live;
+        returns whether it is selected.
+        """
+        if symbol in self._selected_symbols:
+            return True
+        symbol_select = getattr(mt5, 'symbol_select', None)
+        if symbol_select is None or not symbol_select(symbol, True):
+            return False
+        self._selected_symbols.add(symbol)
+        return True
+
+    def _get_symbol_tick(self, symbol, max_age=0.5):
+        """Returns mt5.symbol_info_tick(symbol), reusing ticks younger than max_age seconds."""
+        cached = self._tick_cache.get(symbol)
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < max_age:
+            return cached[1]
+        tick = mt5.symbol_info_tick(symbol)
+        if tick is not None:
+            self._tick_cache[symbol] = (now, tick)
+        return tick
+
+    def _close_tickets(self, tickets, max_workers=8):
+        """
+        Sends close orders for all tickets concurrently (see TradeExecutor.close_all)
+        and returns {ticket: success}.
+        """
+        results = self.trade_executor.close_all(tickets, max_workers)
+        if results:
+            self._invalidate_account_cache()
+        return results
+
     def update_open_positions_pnl(self):
         """
         Fetches open positions from MT5, updates their P&L, and syncs with the in-memory list.
         """
-        mt5_positions_df = self.agents['risk_manager'].portfolio_manager.get_positions()
+        mt5_positions_df = self._get_positions_df(refresh=True)
         if mt5_positions_df is None or mt5_positions_df.empty:
+            self._unrealized_pnl = 0.0
             if self.open_positions:
                  logging.info("All positions appear to be closed.")
                  self.open_positions = []
+                 self._ticket_to_idx = {}
+                 self._pnl = np.empty(0, dtype=np.float64)
+                 self._peaks = np.empty(0, dtype=np.float64)
+                 self._open_ts = np.empty(0, dtype=np.int64)
             return
 
         synced_positions = []
+        synced_peaks = []
         mt5_tickets = set(mt5_positions_df['ticket'])
+        old_index = self._ticket_to_idx
+        old_peaks = self._peaks
+        # Convert all open times in one pass instead of a Timestamp per row
+        open_ts = mt5_positions_df['time'].to_numpy(dtype=np.int64)
+        open_times = pd.to_datetime(open_ts, unit='s')
 
-        # Update existing positions and add new ones
-        for _, mt5_pos in mt5_positions_df.iterrows():
-            existing_pos = next((p for p in self.open_positions if p['ticket'] == mt5_pos['ticket']), None)
+        # Update existing positions and add new ones, iterating plain column lists
+        columns = mt5_positions_df[
+            ['ticket', 'symbol', 'type', 'volume', 'price_open', 'price_current', 'profit']
+        ].to_dict('list')
+        now = datetime.now()
+        for row, (ticket, symbol, position_type, volume, price_open, price_current, profit) in enumerate(
+            zip(*columns.values())
+        ):
+            idx = old_index.get(ticket)
+            existing_pos = self.open_positions[idx] if idx is not None else None
 
             if existing_pos:
-                # Update P&L and current price
-                existing_pos['pnl'] = mt5_pos['profit']
-                existing_pos['current_price'] = mt5_pos['price_current']
-                existing_pos['last_update'] = datetime.now()
+                # Update P&L and current price; the peak carries over from the last sync
+                existing_pos['pnl'] = profit
+                existing_pos['current_price'] = price_current
+                existing_pos['last_update'] = now
                 synced_positions.append(existing_pos)
+                synced_peaks.append(old_peaks[idx])
             else:
                 # Add new position found on MT5
                 new_pos = {
-                    'ticket': mt5_pos['ticket'],
-                    'symbol': mt5_pos['symbol'],
-                    'direction': 'BUY' if mt5_pos['type'] == 0 else 'SELL',
-                    'volume': mt5_pos['volume'],
-                    'entry_price': mt5_pos['price_open'],
-                    'current_price': mt5_pos['price_current'],
-                    'pnl': mt5_pos['profit'],
-                    'timestamp': pd.to_datetime(mt5_pos['time'], unit='s'),
-                    'last_update': datetime.now(),
-                    'peak_pnl': mt5_pos['profit']
+                    'ticket': ticket,
+                    'symbol': symbol,
+                    'direction': self._DIR[position_type],
+                    'volume': volume,
+                    'entry_price': price_open,
+                    'current_price': price_current,
+                    'pnl': profit,
+                    'timestamp': open_times[row],
+                    'last_update': now,
+                    'peak_pnl': profit
                 }
                 synced_positions.append(new_pos)
+                synced_peaks.append(new_pos['peak_pnl'])
                 logging.info(f"✅ New position {new_pos['ticket']} ({new_pos['symbol']}) detected and added to tracking.")
 
         # Handle closed positions (in-memory but not on MT5)
         for mem_pos in self.open_positions:
             if mem_pos['ticket'] not in mt5_tickets:
                 self.realized_pnl += mem_pos['pnl']
-                self.closed_trades.append(mem_pos)
-                logging.info(f"📉 Position {mem_pos['ticket']} ({mem_pos['symbol']}) closed. Realized P&L: ${mem_pos['pnl']:.2f}")
+                self._record_closed_trade(mem_pos)
+                logging.info("📉 Position %s (%s) closed. Realized P&L: $%.2f", mem_pos['ticket'], mem_pos['symbol'], mem_pos['pnl'])
 
         self.open_positions = synced_positions
+        self._ticket_to_idx = {p['ticket']: i for i, p in enumerate(synced_positions)}
+        self._peaks = np.array(synced_peaks, dtype=np.float64)
+        self._open_ts = open_ts
+        # The broker profit column is exactly the synced positions' P&L, in row order
+        self._pnl = mt5_positions_df['profit'].to_numpy(dtype=np.float64)
 
         # Update portfolio value
-        unrealized_pnl = sum(p['pnl'] for p in self.open_positions)
+        unrealized_pnl = float(self._pnl.sum())
+        self._unrealized_pnl = unrealized_pnl
         self.portfolio_value = self.initial_balance + self.realized_pnl + unrealized_pnl
         # logging.info(f"💰 Portfolio updated. Value: ${self.portfolio_value:,.2f}, Unrealized P&L: ${unrealized_pnl:,.2f}")
 
+    def _record_closed_trade(self, position):
+        """Appends a closed position to closed_trades and the closed-trade store."""
+        self.closed_trades.append(position)
+        self._closed.record(position)
+
+    def closed_trades_df(self):
+        """
+        Closed trades as a DataFrame (pnl, symbol, entry_time, exit_time), built from
+        the column store and reused until the next trade closes.
+        """
+        return self._closed.to_df()
+
+    def _track_positions(self):
+        """Rebuilds the ticket -> index map and the P&L, peak and open-time arrays from open_positions."""
+        self._ticket_to_idx = {p['ticket']: i for i, p in enumerate(self.open_positions)}
+        self._pnl = np.array([p['pnl'] for p in self.open_positions], dtype=np.float64)
+        self._peaks = np.array(
+            [p.get('peak_pnl', p['pnl']) for p in self.open_positions], dtype=np.float64
+        )
+        self._open_ts = np.array(
+            [np.datetime64(p['timestamp'], 's') for p in self.open_positions], dtype='datetime64[s]'
+        ).astype(np.int64)
+
     def check_and_close_positions(self):
         """
         Implements advanced position closing logic based on P&L, time, etc.
@@ -197,45 +501,62 @@ class LiveTrader:
         if not self.open_positions:
             return
 
+        # Evaluate all rules at once over the position column arrays
+        positions = self.open_positions
+        n_positions = len(positions)
+        if len(self._pnl) != n_positions or len(self._peaks) != n_positions or len(self._open_ts) != n_positions:
+            self._track_positions()
+        pnl = self._pnl
+        peaks = self._peaks
+        ages = np.datetime64(datetime.now(), 's').astype(np.int64) - self._open_ts
+        
+        # 4. Trailing Stop (peak tracks the best P&L seen)
+        np.maximum(peaks, pnl, out=peaks)
+        trailing = (peaks > 30) & (pnl < peaks * 0.7)
+        # 3. Time-based Exit
+        timed_out = ages > 4 * 3600
+        # 1. Take Profit at +$75 / 2. Stop Loss at -$50
+        take_profit = pnl > 75
+        stop_loss = pnl < -50
+        
+        # Later rules take precedence, as in the original sequential checks
+        reasons = np.select([trailing, timed_out, take_profit, stop_loss], [4, 3, 1, 2], default=0)
+        
         positions_to_close = []
-        for pos in self.open_positions:
-            close_reason = None
-
-            # 1. Take Profit
-            if pos['pnl'] > 75: # Take profit at +$75
+        for i in np.flatnonzero(reasons):
+            pos = positions[i]
+            pos['peak_pnl'] = peaks[i]
+            reason_code = reasons[i]
+            
+            if reason_code == 1:
                 close_reason = f"take profit target (P&L: ${pos['pnl']:.2f})"
-
-            # 2. Stop Loss
-            elif pos['pnl'] < -50: # Stop loss at -$50
+            elif reason_code == 2:
                 close_reason = f"stop loss target (P&L: ${pos['pnl']:.2f})"
-                
-            # 3. Time-based Exit
-            position_age = datetime.now() - pos['timestamp']
-            if position_age > timedelta(hours=4):
+            elif reason_code == 3:
                 close_reason = f"time-based exit (>4 hours)"
-
-            # 4. Trailing Stop
-            if pos['pnl'] > pos.get('peak_pnl', pos['pnl']):
-                pos['peak_pnl'] = pos['pnl']
-            elif pos.get('peak_pnl', 0) > 30 and pos['pnl'] < pos['peak_pnl'] * 0.7:
+            else:
                 close_reason = f"trailing stop (peak P&L: ${pos['peak_pnl']:.2f}, current: ${pos['pnl']:.2f})"
+            
+            logging.info("🎯 Marking position %s (%s) for closure: %s", pos['ticket'], pos['symbol'], close_reason)
+            positions_to_close.append(pos['ticket'])
 
-            if close_reason:
-                logging.info(f"🎯 Marking position {pos['ticket']} ({pos['symbol']}) for closure: {close_reason}")
-                positions_to_close.append(pos['ticket'])
-
-        # Close marked positions
-        for ticket in positions_to_close:
-            success = self.trade_executor.close_trade(ticket)
+        # Close marked positions concurrently
+        for ticket, success in self._close_tickets(positions_to_close).items():
             if success:
-                logging.info(f"✅ Successfully closed position {ticket}.")
+                logging.info("✅ Successfully closed position %s.", ticket)
             else:
-                logging.error(f"❌ Failed to close position {ticket}.")
+                logging.error("❌ Failed to close position %s.", ticket)
 
-    def continuous_position_monitoring(self):
+    def continuous_position_monitoring(self, force=False):
         """
-        High-frequency monitoring of open positions with dynamic reinforcement.
+        High-frequency monitoring of open positions with dynamic reinforcement. Runs at
+        most once per position_update_frequency_seconds unless forced (rapid-change wake-up).
         """
+        now = time.monotonic()
+        if not force and now < self._next_monitor_deadline:
+            return
+        self._next_monitor_deadline = now + self.position_update_frequency_seconds
+        
         logging.info(f"\n--- Continuous Position Monitoring ({datetime.now().strftime('%H:%M:%S')}) ---")
         self.update_open_positions_pnl()
         
@@ -245,8 +566,7 @@ class LiveTrader:
         
         self.check_and_close_positions()
 
-        unrealized_pnl = sum(p['pnl'] for p in self.open_positions)
-        logging.info(f"💰 Portfolio Value: ${self.portfolio_value:,.2f} | Open Positions: {len(self.open_positions)} | Unrealized P&L: ${unrealized_pnl:,.2f}")
+        logging.info(f"💰 Portfolio Value: ${fmt_unsigned(self.portfolio_value)} | Open Positions: {len(self.open_positions)} | Unrealized P&L: ${fmt_unsigned(self._unrealized_pnl)}")
         logging.info("--- End of Monitoring ---")
     
 
@@ -254,80 +574,84 @@ class LiveTrader:
         """
         Runs the main agentic workflow for making new trading decisions.
         """
+        asyncio.run(self.arun_main_trading_cycle())
+
+    async def _acollect_market_data(self, symbols, symbol_suffix, timeframes, timeframe_bars, max_concurrent_symbols=8):
+        """Collects price data for all symbols concurrently; returns {symbol: data}."""
+        semaphore = asyncio.Semaphore(max_concurrent_symbols)
+
+        async def fetch(symbol):
+            async with semaphore:
+                return await self.agents['data_analyst'].aexecute({
+                    'source': 'mt5',
+                    'symbol': symbol + symbol_suffix,
+                    'timeframes': timeframes,
+                    'num_bars': timeframe_bars
+                })
+
+        # One MT5 session for all symbols instead of reconnecting per symbol
+        with self.mt5_collector.session():
+            results = await asyncio.gather(*(fetch(symbol) for symbol in symbols))
+
+        return {symbol: data for symbol, data in zip(symbols, results) if data}
+
+    async def arun_main_trading_cycle(self):
+        """
+        Async body of the main trading cycle. Independent phases (price data collection
+        and the economic calendar) run concurrently; the LLM agents run off the event loop.
+        """
         logging.info("\n" + "="*60)
-        logging.info(f"🚀 Starting New Trading Cycle at {datetime.now().strftime('%H:%M:%S')}")
+        # One wall-clock read per cycle, shared by the header and the cycle summary
+        cycle_started = datetime.now()
+        logging.info(f"🚀 Starting New Trading Cycle at {cycle_started:%H:%M:%S}")
         logging.info("="*60)
 
         # 2. Data Collection for all symbols
-        symbols = self.config['trading']['symbols'].split(',')
-        symbol_suffix = self.config['mt5'].get('symbol_suffix', '')
-        timeframes = [mt5.TIMEFRAME_M5, mt5.TIMEFRAME_M15, mt5.TIMEFRAME_H1, mt5.TIMEFRAME_H4, mt5.TIMEFRAME_D1]
-        timeframe_bars = {
-            mt5.TIMEFRAME_M5: 240,
-            mt5.TIMEFRAME_M15: 80,
-            mt5.TIMEFRAME_H1: 20,
-            mt5.TIMEFRAME_H4: 120,
-            mt5.TIMEFRAME_D1: 100
-        }
-
-        all_price_data = {}
-        for symbol in symbols:
-            symbol_with_suffix = symbol + symbol_suffix
-            data = self.agents['data_analyst'].execute({
-                'source': 'mt5',
-                'symbol': symbol_with_suffix,
-                'timeframes': timeframes,
-                'num_bars': timeframe_bars
-            })
-            if data:
-                all_price_data[symbol] = data
+        # Price data and the economic calendar have no dependency on each other
+        all_price_data, economic_events = await asyncio.gather(
+            self._acollect_market_data(self._symbols, self._symbol_suffix, self._timeframes, self._timeframe_bars),
+            self.agents['data_analyst'].aexecute({'source': 'economic_calendar'})
+        )
 
         if not all_price_data:
             logging.warning("Could not fetch price data for any symbol. Retrying in 60 seconds...")
-            time.sleep(60)
+            await asyncio.sleep(60)
             return
 
         # 3. UFO Calculation - with robust data validation
-        reshaped_data = {}
+        # Invert {symbol: {timeframe: df}} into {timeframe: {symbol: close}} in one pass,
+        # then build each timeframe's matrix with a single concat
+        closes_by_tf = {}
         valid_data_count = 0
         
         for symbol, timeframe_data in all_price_data.items():
             if timeframe_data is None:
-                logging.warning(f"No timeframe data for symbol {symbol}")
+                logging.warning("No timeframe data for symbol %s", symbol)
                 continue
                 
             for timeframe, df in timeframe_data.items():
                 if df is None or df.empty:
-                    logging.warning(f"No data for {symbol} on timeframe {timeframe}")
+                    logging.warning("No data for %s on timeframe %s", symbol, timeframe)
                     continue
                     
                 if 'close' not in df.columns:
-                    logging.error(f"Missing 'close' column for {symbol} on timeframe {timeframe}")
+                    logging.error("Missing 'close' column for %s on timeframe %s", symbol, timeframe)
                     continue
                     
-                try:
-                    if timeframe not in reshaped_data:
-                        reshaped_data[timeframe] = pd.DataFrame()
-                    reshaped_data[timeframe][symbol] = df['close']
-                    valid_data_count += 1
-                except Exception as e:
-                    logging.error(f"Error processing data for {symbol} on timeframe {timeframe}: {e}")
-                    continue
+                closes_by_tf.setdefault(timeframe, {})[symbol] = df['close']
+                valid_data_count += 1
+        
+        reshaped_data = {timeframe: pd.concat(closes, axis=1) for timeframe, closes in closes_by_tf.items()}
         
         if valid_data_count == 0:
             logging.error("No valid market data available for UFO calculation. Skipping this cycle.")
             return
 
-        incremental_sums_dict = {}
-        for timeframe, price_df in reshaped_data.items():
-            variation_data = self.ufo_calculator.calculate_percentage_variation(price_df)
-            incremental_sums_dict[timeframe] = self.ufo_calculator.calculate_incremental_sum(variation_data)
-
-        ufo_data = self.ufo_calculator.generate_ufo_data(incremental_sums_dict)
+        # Variation -> incremental sum -> currency strength in one pass per timeframe,
+        # the independent timeframes computed concurrently on the shared worker pool
+        ufo_data = self.ufo_calculator.generate_ufo_data_from_prices(reshaped_data, executor=self._io_pool)
 
-        oscillation_analysis = self.ufo_calculator.detect_oscillations(ufo_data)
-        uncertainty_metrics = self.ufo_calculator.analyze_market_uncertainty(ufo_data, oscillation_analysis)
-        coherence_analysis = self.ufo_calculator.detect_timeframe_coherence(ufo_data)
+        oscillation_analysis, uncertainty_metrics, coherence_analysis = self.ufo_calculator.analyze(ufo_data)
 
         enhanced_ufo_data = {
             'raw_data': ufo_data,
@@ -338,45 +662,47 @@ class LiveTrader:
 
         # Store UFO data for reinforcement analysis
         self.last_ufo_data = enhanced_ufo_data
+        self._index_ufo_snapshot(enhanced_ufo_data)
         
         # 4. First Priority: UFO Portfolio Management
-        open_positions_df = self.agents['risk_manager'].portfolio_manager.get_positions()
+        open_positions_df = self._get_positions_df(refresh=True)
         if open_positions_df is not None and not open_positions_df.empty:
             logging.info(f"\n--- UFO Portfolio Management: {len(open_positions_df)} positions ---")
             
-            # Analyze all positions for reinforcement opportunities
-            self.analyze_positions_for_reinforcement()
+            # Analyze all positions for reinforcement opportunities (gated here, as in
+            # continuous monitoring, so a disabled engine costs no call at all)
+            if self.dynamic_reinforcement_engine.enabled:
+                self.analyze_positions_for_reinforcement()
 
-            account_info = self.mt5_collector.connect() and mt5.account_info()
+            account_info = self._cached_account_info()
             if account_info:
                 portfolio_stop_breached, stop_reason = self.ufo_engine.check_portfolio_equity_stop(
                     account_info.balance, account_info.equity
                 )
                 if portfolio_stop_breached:
                     logging.critical(f"🚨 UFO PORTFOLIO STOP TRIGGERED: {stop_reason}")
-                    for _, position in open_positions_df.iterrows():
-                        self.trade_executor.close_trade(position.ticket)
+                    await asyncio.to_thread(self._close_tickets, open_positions_df['ticket'].tolist())
                     logging.critical("🚨 All positions closed. Waiting 5 minutes before resuming...")
-                    time.sleep(300)
+                    await asyncio.sleep(300)
                     return
 
-            economic_events_for_session = self.agents['data_analyst'].execute({'source': 'economic_calendar'})
-            should_close, close_reason = self.ufo_engine.should_close_for_session_end(economic_events_for_session)
+            # Reuse the calendar fetched alongside the price data for this cycle
+            should_close, close_reason = self.ufo_engine.should_close_for_session_end(economic_events)
             if should_close:
                 logging.info(f"🌅 UFO SESSION END: {close_reason}")
-                for _, position in open_positions_df.iterrows():
-                    self.trade_executor.close_trade(position.ticket)
-                time.sleep(300)
+                await asyncio.to_thread(self._close_tickets, open_positions_df['ticket'].tolist())
+                await asyncio.sleep(300)
                 return
 
             current_market_data = self.get_real_time_market_data_for_positions(open_positions_df)
-            for _, position in open_positions_df.iterrows():
+            # Plain dict records: the engine reads positions through .get()
+            for position in open_positions_df.to_dict('records'):
                 should_reinforce, reason, reinforcement_plan = self.ufo_engine.should_reinforce_position(
                     position, enhanced_ufo_data, current_market_data
                 )
                 
                 if should_reinforce:
-                    logging.info(f"🔧 UFO Compensation: {reason}")
+                    logging.info("🔧 UFO Compensation: %s", reason)
                     success, result_msg = self.ufo_engine.execute_compensation_trade(
                         position, reinforcement_plan, self.trade_executor
                     )
@@ -385,15 +711,16 @@ class LiveTrader:
                     else:
                         logging.error(f"❌ Compensation failed: {result_msg}")
                 elif "close position" in reason:
-                    logging.info(f"📊 UFO Analysis: Closing {position.ticket} - {reason}")
-                    self.trade_executor.close_trade(position.ticket)
+                    logging.info("📊 UFO Analysis: Closing %s - %s", position['ticket'], reason)
+                    self.trade_executor.close_trade(position['ticket'])
                 else:
-                    logging.info(f"📈 Position {position.ticket} - {reason}")
+                    logging.info("📈 Position %s - %s", position['ticket'], reason)
+            # Compensation trades and closes above change balance/equity
+            self._invalidate_account_cache()
 
         # 5. Agentic Workflow for new trade decisions
-        economic_events = self.agents['data_analyst'].execute({'source': 'economic_calendar'})
-        open_positions_df = self.agents['risk_manager'].portfolio_manager.get_positions()
-        research_result = self.agents['researcher'].execute(enhanced_ufo_data, economic_events)
+        open_positions_df = self._get_positions_df()
+        research_result = await self.agents['researcher'].aexecute(enhanced_ufo_data, economic_events)
 
         diversification_config = {
             'min_positions_for_session': self.ufo_engine.min_positions_for_session,
@@ -401,39 +728,24 @@ class LiveTrader:
             'max_concurrent_positions': self.ufo_engine.max_concurrent_positions
         }
 
-        trade_decision_str = self.agents['trader'].execute(
+        trade_decision_str = await self.agents['trader'].aexecute(
             research_result['consensus'],
             open_positions_df,
             diversification_config=diversification_config
         )
 
-        risk_assessment = self.agents['risk_manager'].execute(trade_decision_str)
+        risk_assessment = await self.agents['risk_manager'].aexecute(trade_decision_str)
 
         if risk_assessment['portfolio_risk_status'] == "STOP_LOSS_BREACHED":
             logging.critical("!!! EQUITY STOP LOSS BREACHED. CEASING ALL TRADING. !!!")
             # This should be handled more gracefully, maybe break the loop
             return
 
-        authorization = self.agents['fund_manager'].execute(trade_decision_str, risk_assessment)
+        authorization = await self.agents['fund_manager'].aexecute(trade_decision_str, risk_assessment)
 
         # 6. Output with Diversification Status
-        position_count = len(open_positions_df) if open_positions_df is not None else 0
-        diversification_status = f"📊 Portfolio Diversification: {position_count}/{self.ufo_engine.max_concurrent_positions} positions"
-
-        if position_count < self.ufo_engine.min_positions_for_session:
-            diversification_status += " ⚠️ Below minimum"
-        elif position_count >= self.ufo_engine.target_positions_when_available:
-            diversification_status += " ✅ Well diversified"
-        else:
-            diversification_status += " 📈 Building diversification"
-
-        logging.info("\n--- Live Trading Cycle Summary ---")
-        logging.info(f"Timestamp: {pd.Timestamp.now()}")
-        logging.info(diversification_status)
-        logging.info(f"Research Consensus: {research_result['consensus']}")
-        logging.info(f"Trade Decision: {trade_decision_str}")
-        logging.info(f"Risk Assessment: {risk_assessment}")
-        logging.info(f"Final Authorization: {authorization}")
+        self.log_cycle_summary(open_positions_df, research_result, trade_decision_str, risk_assessment, authorization,
+                               cycle_started=cycle_started)
 
         # 7. UFO-based Trade Execution
         should_execute = "APPROVE" in authorization.upper()
@@ -444,14 +756,12 @@ class LiveTrader:
                 should_execute = True
 
         if should_execute:
-            account_info = self.mt5_collector.connect() and mt5.account_info()
-            # Get economic events for UFO engine decision (matching simulation)
-            economic_events_for_trade = self.agents['data_analyst'].execute({'source': 'economic_calendar'})
+            account_info = self._cached_account_info()
             should_trade, trade_reason = self.ufo_engine.should_open_new_trades(
                 current_positions=open_positions_df,
                 portfolio_status={'balance': account_info.balance, 'equity': account_info.equity} if account_info else None,
                 ufo_data=enhanced_ufo_data,
-                economic_events=economic_events_for_trade
+                economic_events=economic_events
             )
 
             if not should_trade:
@@ -459,12 +769,8 @@ class LiveTrader:
             else:
                 logging.info(f"🎯 UFO Engine: {trade_reason}")
                 try:
-                    json_match = re.search(r'{.*}', trade_decision_str, re.DOTALL)
-                    if json_match:
-                        json_str = json_match.group(0)
-                        json_str = re.sub(r'//.*?\n', '\n', json_str)
-                        json_str = re.sub(r',\s*([}\]])', r'\1', json_str)
-                        parsed_data = json.loads(json_str)
+                    parsed_data = parse_llm_json(trade_decision_str)
+                    if parsed_data is not None:
 
                         actions_list = []
                         if 'actions' in parsed_data:
@@ -482,7 +788,7 @@ class LiveTrader:
                                 })
 
                         # Execute the parsed trades
-                        logging.info(f"📋 Executing {len(actions_list)} trades from approved plan...")
+                        logging.info("📋 Executing %d trades from approved plan...", len(actions_list))
                         
                         successful_trades = 0
                         failed_trades = 0
@@ -503,11 +809,11 @@ class LiveTrader:
                                 elif direction == 'SELL':
                                     trade_type = mt5.ORDER_TYPE_SELL
                                 else:
-                                    logging.error(f"Invalid direction '{direction}' for {symbol}")
+                                    logging.error("Invalid direction '%s' for %s", direction, symbol)
                                     failed_trades += 1
                                     continue
                                 
-                                logging.info(f"🎯 Executing: {direction} {volume} lots of {symbol}")
+                                logging.info("🎯 Executing: %s %s lots of %s", direction, volume, symbol)
                                 
                                 # Execute trade using UFO methodology (no fixed SL/TP)
                                 result = self.trade_executor.execute_ufo_trade(
@@ -518,51 +824,132 @@ class LiveTrader:
                                 )
                                 
                                 if result and result.retcode == mt5.TRADE_RETCODE_DONE:
-                                    logging.info(f"✅ Trade executed successfully: {symbol} {direction} {volume} lots, Ticket: {result.order}")
+                                    logging.info("✅ Trade executed successfully: %s %s %s lots, Ticket: %s",
+                                                 symbol, direction, volume, result.order)
                                     successful_trades += 1
                                 else:
-                                    error_msg = f"Trade failed: {symbol} {direction} {volume} lots"
                                     if result:
-                                        error_msg += f" - RetCode: {result.retcode}"
-                                    logging.error(f"❌ {error_msg}")
+                                        logging.error("❌ Trade failed: %s %s %s lots - RetCode: %s",
+                                                      symbol, direction, volume, result.retcode)
+                                    else:
+                                        logging.error("❌ Trade failed: %s %s %s lots", symbol, direction, volume)
                                     failed_trades += 1
                                     
                             except Exception as trade_error:
-                                logging.error(f"❌ Error executing individual trade: {trade_error}")
+                                logging.error("❌ Error executing individual trade: %s", trade_error)
                                 failed_trades += 1
                         
+                        if successful_trades:
+                            self._invalidate_account_cache()
+                        
                         # Summary of execution results
                         total_trades = successful_trades + failed_trades
-                        logging.info(f"\n📊 Trade Execution Summary:")
-                        logging.info(f"✅ Successful: {successful_trades}/{total_trades}")
-                        logging.info(f"❌ Failed: {failed_trades}/{total_trades}")
+                        logging.info("\n📊 Trade Execution Summary:")
+                        logging.info("✅ Successful: %d/%d", successful_trades, total_trades)
+                        logging.info("❌ Failed: %d/%d", failed_trades, total_trades)
                         
                         if successful_trades > 0:
-                            logging.info(f"🎉 {successful_trades} new positions opened successfully!")
+                            logging.info("🎉 %d new positions opened successfully!", successful_trades)
                         else:
                             logging.warning("⚠️ No trades were executed successfully")
 
                 except Exception as e:
-                    logging.error(f"Error during UFO trade execution: {e}")
-                    import traceback
-                    logging.error(traceback.format_exc())
+                    logging.exception("Error during UFO trade execution: %s", e)
+
+    def log_cycle_summary(self, open_positions_df, research_result, trade_decision_str, risk_assessment, authorization,
+                          cycle_started=None):
+        """
+        Logs the end-of-cycle summary, at most once per summary_interval_s. Skipped
+        entirely when INFO is disabled, since formatting the agent outputs (trade
+        decision, risk assessment) is not free. The timestamp is the cycle's start time
+        when given.
+        """
+        if not logging.getLogger().isEnabledFor(logging.INFO):
+            return
+        now = time.monotonic()
+        if now - self._last_summary_ts < self.summary_interval_s:
+            return
+        self._last_summary_ts = now
+
+        ufo_engine = self.ufo_engine
+        position_count = len(open_positions_df) if open_positions_df is not None else 0
+        diversification_status = f"📊 Portfolio Diversification: {position_count}/{ufo_engine.max_concurrent_positions} positions"
+
+        if position_count < ufo_engine.min_positions_for_session:
+            diversification_status += " ⚠️ Below minimum"
+        elif position_count >= ufo_engine.target_positions_when_available:
+            diversification_status += " ✅ Well diversified"
+        else:
+            diversification_status += " 📈 Building diversification"
+
+        # One multi-line record instead of one handler dispatch per line
+        logging.info("\n".join([
+            "\n--- Live Trading Cycle Summary ---",
+            f"Timestamp: {pd.Timestamp(cycle_started) if cycle_started is not None else pd.Timestamp.now()}",
+            diversification_status,
+            f"Research Consensus: {research_result['consensus']}",
+            f"Trade Decision: {trade_decision_str}",
+            f"Risk Assessment: {risk_assessment}",
+            f"Final Authorization: {authorization}",
+        ]))
+
+    def request_position_check(self):
+        """Wakes the main loop so position monitoring runs now instead of after the sleep."""
+        self._wake_event.set()
+
+    def _detect_rapid_portfolio_change(self, previous_value, current_value):
+        """Returns (is_rapid, change_pct) for an equity move between two polls."""
+        if not previous_value:
+            return False, 0.0
+        change_pct = (current_value - previous_value) / previous_value * 100
+        # Compare squares against the precomputed squared threshold instead of abs()
+        return change_pct * change_pct > self._rapid_change_threshold_sq, change_pct
+
+    def _watch_equity(self):
+        """
+        Background loop: polls account equity while positions are open and requests an
+        immediate position check on a rapid move. Exits when _stop_event is set.
+        """
+        last_equity = None
+        while not self._stop_event.wait(self.equity_watch_seconds):
+            if not self.open_positions:
+                last_equity = None
+                continue
+            try:
+                # Through the collector, so the poll never overlaps a reconnect/shutdown
+                info = self.mt5_collector.account_info()
+            except Exception as e:
+                logging.debug("Equity watcher poll failed: %s", e)
+                continue
+            if info is None:
+                continue
+            is_rapid, change_pct = self._detect_rapid_portfolio_change(last_equity, info.equity)
+            if is_rapid:
+                logging.info("⚡ Rapid portfolio change: %.2f%% - running position monitoring now", change_pct)
+                self.request_position_check()
+            last_equity = info.equity
 
     def run(self):
         """
         Runs the main trading loop, orchestrating the main cycle and continuous monitoring.
         Similar to simulation's run_full_day_simulation() but continuous.
         """
-        self.last_cycle_time = time.time() - self.cycle_period_seconds - 1 # Ensure the first cycle runs immediately
+        # Scheduling uses the monotonic clock so NTP/DST/suspend jumps cannot skew cycles
+        self.last_cycle_time = time.monotonic() - self.cycle_period_seconds - 1 # Ensure the first cycle runs immediately
         
         logging.info(f"🚀 Starting Live Trading")
         logging.info(f"⏰ Cycle Frequency: Every {self.cycle_period_minutes} minutes")
         if self.continuous_monitoring_enabled:
             logging.info(f"📊 Continuous Monitoring: Position updates every {self.position_update_frequency_minutes} minutes")
+            self._stop_event.clear()
+            threading.Thread(target=self._watch_equity, name="equity-watcher", daemon=True).start()
 
+        backoff = _LOOP_BACKOFF_MIN
         try:
             while True:
                 try:
-                    now = time.time()
+                    self._check_mt5_connection()
+                    now = time.monotonic()
                     
                     # Continuous position monitoring between cycles (like simulation)
                     if self.continuous_monitoring_enabled and self.open_positions:
@@ -587,32 +974,63 @@ class LiveTrader:
                     
                     # Sleep until next monitoring interval or cycle
                     if self.continuous_monitoring_enabled and self.open_positions:
-                        sleep_duration = min(self.position_update_frequency_seconds, max(1, time_to_next_cycle))
+                        sleep_duration = min(self.position_update_frequency_seconds, max(_LOOP_MIN_SLEEP, time_to_next_cycle))
                     else:
-                        sleep_duration = min(60, max(1, time_to_next_cycle))
+                        sleep_duration = min(60, max(_LOOP_MIN_SLEEP, time_to_next_cycle))
                     
                     if time_to_next_cycle > 60:
                         logging.info(f"--- Next cycle in {time_to_next_cycle:.0f} seconds ---")
-                    time.sleep(sleep_duration)
+                    # Interruptible sleep: the equity watcher (or request_position_check) wakes
+                    # the loop early so a rapid move is handled immediately
+                    if self._wake_event.wait(sleep_duration):
+                        self._wake_event.clear()
+                        if self.open_positions:
+                            self.continuous_position_monitoring(force=True)
+                    backoff = _LOOP_BACKOFF_MIN
 
                 except KeyboardInterrupt:
                     logging.info("\nTrading interrupted by user. Exiting...")
                     break
-                except Exception as e:
-                    logging.critical(f"Error in main trading loop: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    logging.info("Waiting 60 seconds before retrying...")
-                    time.sleep(60)
+                except _PROGRAMMER_ERRORS:
+                    # A bug, not a transient failure: retrying would only repeat it
+                    logging.exception("❌ Programming error in main trading loop - stopping")
+                    raise
+                except Exception:
+                    # Recoverable (MT5/network/LLM) failure: retry with jittered exponential backoff
+                    delay = backoff + random.random()
+                    logging.exception("Error in main trading loop")
+                    logging.info("Retrying in %.1f seconds...", delay)
+                    time.sleep(delay)
+                    backoff = min(backoff * 2, _LOOP_BACKOFF_MAX)
         finally:
-            # Final summary
-            logging.info("\n" + "="*60)
-            logging.info("🎯 LIVE TRADING SESSION COMPLETED")
-            logging.info(f"Total Cycles: {self.cycle_count}")
-            logging.info(f"Open Positions: {len(self.open_positions)}")
-            logging.info(f"Closed Trades: {len(self.closed_trades)}")
-            logging.info(f"Portfolio Value: ${self.portfolio_value:,.2f}")
-            logging.info("="*60)
+            self._stop_event.set()
+            self._release_mt5_session()
+            self._io_pool.shutdown(wait=False)
+            self.log_session_summary()
+    
+    def log_session_summary(self):
+        """Logs the end-of-session summary as a single log record."""
+        cycle_count = self.cycle_count
+        closed_trades = self.closed_trades
+        if cycle_count == 0 and not closed_trades:
+            logging.info("🎯 Live trading session ended before the first cycle - nothing to summarize.")
+            return
+
+        lines = [
+            "\n" + "="*60,
+            "🎯 LIVE TRADING SESSION COMPLETED",
+            f"Total Cycles: {cycle_count}",
+            f"Open Positions: {len(self.open_positions)}",
+            f"Closed Trades: {len(closed_trades)}",
+        ]
+        closed_count = len(self._closed)
+        if closed_count:
+            # closed_count > 0 here, so the win rate needs no zero-division guard
+            winners = self._closed.winners
+            lines.append(f"Closed P&L: ${fmt_signed(self._closed.total_pnl)} | Winners: {winners}/{closed_count} ({winners * 100.0 / closed_count:.1f}%)")
+        lines.append("Portfolio Value: $" + fmt_unsigned(self.portfolio_value))
+        lines.append("="*60)
+        logging.info("\n".join(lines))
     
     def check_and_execute_dynamic_reinforcement(self):
         """
@@ -624,11 +1042,11 @@ class LiveTrader:
         
         try:
             # Get current market data for all open positions
-            positions_df = self.agents['risk_manager'].portfolio_manager.get_positions()
+            positions_df = self._get_positions_df()
             if positions_df is None or positions_df.empty:
                 return
             
-            current_market_data = self.get_real_time_market_data_for_positions(positions_df)
+            current_market_data, market_arrays = self.get_market_data_with_arrays(positions_df)
             
             # Get current UFO data for analysis
             current_ufo_data = getattr(self, 'last_ufo_data', None)
@@ -636,35 +1054,33 @@ class LiveTrader:
             # Check each position for reinforcement opportunities
             positions_requiring_reinforcement = []
             
-            for _, position in positions_df.iterrows():
-                # Detect market events that might trigger reinforcement
-                market_events = self.dynamic_reinforcement_engine.detect_market_events(
-                    [position], current_market_data, current_ufo_data
+            positions = positions_df.to_dict('records')
+            
+            # Detect market events that might trigger reinforcement, for all positions in one pass
+            for idx, event in self.dynamic_reinforcement_engine.detect_market_events_batch(
+                positions, current_market_data, current_ufo_data, market_arrays=market_arrays
+            ):
+                position = positions[idx]
+                # Calculate dynamic reinforcement plan
+                reinforcement_plan = self.dynamic_reinforcement_engine.calculate_dynamic_reinforcement(
+                    position, event, current_market_data, current_ufo_data
                 )
                 
-                if market_events:
-                    for event in market_events:
-                        # Calculate dynamic reinforcement plan
-                        reinforcement_plan = self.dynamic_reinforcement_engine.calculate_dynamic_reinforcement(
-                            position, event, current_market_data, current_ufo_data
-                        )
-                        
-                        if reinforcement_plan and reinforcement_plan.get('execute', False):
-                            positions_requiring_reinforcement.append((position, reinforcement_plan, event))
+                if reinforcement_plan and reinforcement_plan.get('execute', False):
+                    positions_requiring_reinforcement.append((position, reinforcement_plan, event))
             
             # Execute reinforcement trades
             for position, plan, event in positions_requiring_reinforcement:
-                self.execute_dynamic_reinforcement(position, plan, event)
+                self.execute_dynamic_reinforcement(position, plan, event, market_data=current_market_data)
                 
         except Exception as e:
-            logging.error(f"❌ Error in dynamic reinforcement check: {e}")
-            import traceback
-            logging.error(traceback.format_exc())
+            logging.exception("❌ Error in dynamic reinforcement check: %s", e)
     
-    def execute_dynamic_reinforcement(self, position, reinforcement_plan, market_event):
+    def execute_dynamic_reinforcement(self, position, reinforcement_plan, market_event, market_data=None):
         """
         Execute a dynamic reinforcement trade based on the calculated plan.
-        Enhanced version with UFO-optimized entry prices.
+        Enhanced version with UFO-optimized entry prices. market_data is the
+        caller's per-position snapshot, reused for pricing when it covers the symbol.
         """
         try:
             compensation_type = reinforcement_plan.get('type', 'dynamic')
@@ -678,39 +1094,44 @@ class LiveTrader:
             # Check if we've already reinforced this position recently
             reinforcement_status = self.dynamic_reinforcement_engine.get_reinforcement_status(position)
             if reinforcement_status.get('can_reinforce', False) is False:
-                logging.info(f"⏳ Position {position.ticket} in cooling period: {reinforcement_status.get('reason')}")
+                logging.info(f"⏳ Position {position['ticket']} in cooling period: {reinforcement_status.get('reason')}")
                 return False
             
             logging.info(f"🔧 Dynamic Reinforcement Triggered: {compensation_type.upper()}")
-            logging.info(f"   Position: {position.symbol} ({position.ticket})")
+            logging.info(f"   Position: {position['symbol']} ({position['ticket']})")
             logging.info(f"   Event: {market_event.get('type', 'unknown')}")
             logging.info(f"   Reason: {reason}")
             logging.info(f"   Additional lots: {additional_lots:.2f}")
             
+            # Reinforcement trades follow the original position's direction
+            position_type = int(position['type'])
+            trade_direction = self._DIR[position_type]
+            trade_type = self._OTYPE[position_type]
+            
             # Calculate optimal entry price using UFO methodology
             optimal_entry_price = self.calculate_ufo_optimized_entry_price(
-                position.symbol,
-                'BUY' if position.type == 0 else 'SELL',
+                position['symbol'],
+                trade_direction,
                 reinforcement_plan,
-                market_event
+                market_event,
+                market_data=market_data
             )
             
             # Prepare the reinforcement trade
-            trade_direction = 'BUY' if position.type == 0 else 'SELL'
-            trade_type = mt5.ORDER_TYPE_BUY if position.type == 0 else mt5.ORDER_TYPE_SELL
             
             # Add comment with details
-            comment = f"UFO {compensation_type} for #{position.ticket}"
+            comment = f"UFO {compensation_type} for #{position['ticket']}"
             
             # Execute the reinforcement trade
             result = self.trade_executor.execute_ufo_trade(
-                symbol=position.symbol,
+                symbol=position['symbol'],
                 trade_type=trade_type,
                 volume=additional_lots,
                 comment=comment
             )
             
             if result and result.retcode == mt5.TRADE_RETCODE_DONE:
+                self._invalidate_account_cache()
                 logging.info(f"✅ Reinforcement executed successfully!")
                 logging.info(f"   New ticket: {result.order}")
                 logging.info(f"   Executed at: {result.price if hasattr(result, 'price') else 'market price'}")
@@ -719,21 +1140,28 @@ class LiveTrader:
                 self.dynamic_reinforcement_engine.record_reinforcement(position, reinforcement_plan)
                 
                 # Track the reinforcement in our position list
+                fill_price = getattr(result, 'price', optimal_entry_price)
+                opened_at = datetime.now()
                 new_position = {
                     'ticket': result.order,
-                    'symbol': position.symbol,
+                    'symbol': position['symbol'],
                     'direction': trade_direction,
                     'volume': additional_lots,
-                    'entry_price': result.price if hasattr(result, 'price') else optimal_entry_price,
-                    'current_price': result.price if hasattr(result, 'price') else optimal_entry_price,
+                    'entry_price': fill_price,
+                    'current_price': fill_price,
                     'pnl': 0.0,
-                    'timestamp': datetime.now(),
+                    'timestamp': opened_at,
                     'peak_pnl': 0.0,
-                    'original_position_ticket': position.ticket,
+                    'original_position_ticket': position['ticket'],
                     'reinforcement_type': compensation_type,
                     'reinforcement_reason': reason
                 }
                 self.open_positions.append(new_position)
+                self._ensure_symbol_selected(new_position['symbol'])
+                self._ticket_to_idx[new_position['ticket']] = len(self.open_positions) - 1
+                self._pnl = np.append(self._pnl, new_position['pnl'])
+                self._peaks = np.append(self._peaks, new_position['peak_pnl'])
+                self._open_ts = np.append(self._open_ts, np.datetime64(opened_at, 's').astype(np.int64))
                 
                 return True
             else:
@@ -746,91 +1174,50 @@ class LiveTrader:
                 return False
                 
         except Exception as e:
-            logging.error(f"❌ Error executing dynamic reinforcement: {e}")
-            import traceback
-            logging.error(traceback.format_exc())
+            logging.exception("❌ Error executing dynamic reinforcement: %s", e)
             return False
     
-    def calculate_ufo_optimized_entry_price(self, symbol, direction, reinforcement_plan, market_event):
+    def calculate_ufo_optimized_entry_price(self, symbol, direction, reinforcement_plan, market_event, market_data=None):
         """
         Calculate the optimal entry price for a reinforcement trade using UFO methodology.
         This considers market conditions, UFO signals, and the type of reinforcement.
         """
         try:
-            # Get current market data
-            current_market_data = self.get_real_time_market_data_for_positions([{'symbol': symbol}])
+            # Reuse the caller's snapshot when it already covers this symbol
+            current_market_data = market_data
+            if not current_market_data or symbol not in current_market_data:
+                current_market_data = self.get_real_time_market_data_for_positions([{'symbol': symbol}])
             
             if symbol not in current_market_data:
-                logging.warning(f"⚠️ No market data for {symbol}, using market execution")
+                logging.warning("⚠️ No market data for %s, using market execution", symbol)
                 return None
             
             current_data = current_market_data[symbol]
             bid = current_data['bid']
             ask = current_data['ask']
             spread = current_data['spread']
-            
+            is_buy = direction == 'BUY'
             # Base price depends on direction
-            if direction == 'BUY':
-                base_price = ask
-            else:
-                base_price = bid
-            
-            # Adjust based on reinforcement type and market event
-            reinforcement_type = reinforcement_plan.get('type', 'standard')
-            event_type = market_event.get('type', '')
-            
-            price_adjustment = 0.0
-            
-            # Apply adjustments based on reinforcement strategy
-            if 'momentum' in reinforcement_type.lower():
-                # For momentum reinforcement, enter slightly ahead of current price
-                if direction == 'BUY':
-                    price_adjustment = spread * 0.5  # Pay half spread extra for urgency
-                else:
-                    price_adjustment = -spread * 0.5
-                    
-            elif 'compensation' in reinforcement_type.lower():
-                # For compensation, try to get better price
-                if direction == 'BUY':
-                    price_adjustment = -spread * 0.25  # Try to buy slightly lower
-                else:
-                    price_adjustment = spread * 0.25  # Try to sell slightly higher
-                    
-            elif 'rapid_loss' in event_type.lower():
-                # For rapid loss recovery, execute immediately at market
-                price_adjustment = 0.0
-                
-            elif 'volatility' in event_type.lower():
-                # In high volatility, add buffer for slippage
-                volatility_multiplier = market_event.get('volatility_multiplier', 1.0)
-                if direction == 'BUY':
-                    price_adjustment = spread * volatility_multiplier
-                else:
-                    price_adjustment = -spread * volatility_multiplier
-            
-            # Calculate final optimal price
-            optimal_price = base_price + price_adjustment
+            base_price = ask if is_buy else bid
             
-            # Apply sanity checks
-            if direction == 'BUY':
-                # Don't pay more than 2 spreads above ask
-                max_price = ask + (spread * 2)
-                optimal_price = min(optimal_price, max_price)
-            else:
-                # Don't sell for less than 2 spreads below bid
-                min_price = bid - (spread * 2)
-                optimal_price = max(optimal_price, min_price)
+            # Adjust based on reinforcement type and market event; the arithmetic and the
+            # two-spread sanity cap run in a compiled kernel
+            kind = reinforcement_kind(reinforcement_plan.get('type', 'standard'), market_event.get('type', ''))
+            optimal_price, price_adjustment = reinforcement_entry_price(
+                is_buy, float(bid), float(ask), float(spread), kind,
+                float(market_event.get('volatility_multiplier', 1.0))
+            )
             
-            logging.info(f"💹 Optimal entry price calculated: {optimal_price:.5f}")
-            logging.info(f"   Base: {base_price:.5f}, Adjustment: {price_adjustment:.5f}")
+            logging.info("💹 Optimal entry price calculated: %.5f", optimal_price)
+            logging.info("   Base: %.5f, Adjustment: %.5f", base_price, price_adjustment)
             
             return optimal_price
             
         except Exception as e:
-            logging.error(f"❌ Error calculating optimal entry price: {e}")
+            logging.error("❌ Error calculating optimal entry price: %s", e)
             return None
     
-    def calculate_ufo_entry_price(self, symbol, direction, ufo_data=None, use_strength=True):
+    def calculate_ufo_entry_price(self, symbol, direction, ufo_data=None, use_strength=True, market_data=None):
         """
         Calculate optimal entry price based on UFO methodology and currency strength.
         This is the main UFO entry price calculation used for new trades.
@@ -840,16 +1227,19 @@ class LiveTrader:
             direction: 'BUY' or 'SELL'
             ufo_data: Enhanced UFO data with currency strengths
             use_strength: Whether to use currency strength for price optimization
+            market_data: Already-fetched {symbol: market data} snapshot to reuse
         
         Returns:
             Optimal entry price based on UFO analysis
         """
         try:
-            # Get current market data
-            current_market_data = self.get_real_time_market_data_for_positions([{'symbol': symbol}])
+            # Reuse the caller's snapshot when it already covers this symbol
+            current_market_data = market_data
+            if not current_market_data or symbol not in current_market_data:
+                current_market_data = self.get_real_time_market_data_for_positions([{'symbol': symbol}])
             
             if symbol not in current_market_data:
-                logging.warning(f"⚠️ No market data for {symbol}, returning None")
+                logging.warning("⚠️ No market data for %s, returning None", symbol)
                 return None
             
             current_data = current_market_data[symbol]
@@ -867,11 +1257,11 @@ class LiveTrader:
             price_adjustment = 0.0
             
             if ufo_data and use_strength:
-                # Extract currencies from symbol
-                clean_symbol = symbol.replace('-ECN', '').replace('/', '')
-                if len(clean_symbol) >= 6:
-                    base_currency = clean_symbol[:3]
-                    quote_currency = clean_symbol[3:6]
+                # Currencies come from the per-symbol table, parsed once
+                meta = self._get_symbol_meta(symbol)
+                if len(meta.clean_symbol) >= 6:
+                    base_currency = meta.base
+                    quote_currency = meta.quote
                     
                     # Get currency strengths from primary trading timeframe (M5)
                     base_strength = self._get_currency_strength_from_ufo(base_currency, ufo_data)
@@ -881,31 +1271,20 @@ class LiveTrader:
                     strength_diff = base_strength - quote_strength
                     
                     # Log strength analysis
-                    logging.info(f"🔬 UFO Strength Analysis for {symbol}:")
-                    logging.info(f"   {base_currency}: {base_strength:.2f}")
-                    logging.info(f"   {quote_currency}: {quote_strength:.2f}")
-                    logging.info(f"   Differential: {strength_diff:.2f}")
+                    logging.info("🔬 UFO Strength Analysis for %s:", symbol)
+                    logging.info("   %s: %.2f", base_currency, base_strength)
+                    logging.info("   %s: %.2f", quote_currency, quote_strength)
+                    logging.info("   Differential: %.2f", strength_diff)
                     
-                    # UFO-based price adjustment logic
-                    if abs(strength_diff) > 1.0:  # Significant strength difference
-                        if direction == 'BUY':
-                            if strength_diff > 0:  # Strong base currency = good for buy
-                                # Try to get slightly better entry (lower price)
-                                price_adjustment = -spread * 0.2  # 20% of spread improvement
-                                logging.info(f"   ✅ Strong {base_currency} - favorable BUY entry")
-                            else:  # Weak base currency = less favorable
-                                # Accept slightly worse entry for weak signal
-                                price_adjustment = spread * 0.1
-                                logging.info(f"   ⚠️ Weak {base_currency} - cautious BUY entry")
-                        else:  # SELL
-                            if strength_diff < 0:  # Weak base currency = good for sell
-                                # Try to get slightly better entry (higher price)
-                                price_adjustment = spread * 0.2  # 20% of spread improvement
-                                logging.info(f"   ✅ Weak {base_currency} - favorable SELL entry")
-                            else:  # Strong base currency = less favorable
-                                # Accept slightly worse entry for weak signal
-                                price_adjustment = -spread * 0.1
-                                logging.info(f"   ⚠️ Strong {base_currency} - cautious SELL entry")
+                    # UFO-based price adjustment: better entry on a strong differential in
+                    # the trade's favour, slightly worse on one against it (compiled kernel)
+                    price_adjustment, signal = strength_entry_adjustment(
+                        direction == 'BUY', float(spread), float(strength_diff)
+                    )
+                    if signal == 1:
+                        logging.info("   ✅ %s %s - favorable %s entry", 'Strong' if direction == 'BUY' else 'Weak', base_currency, direction)
+                    elif signal == 0:
+                        logging.info("   ⚠️ %s %s - cautious %s entry", 'Weak' if direction == 'BUY' else 'Strong', base_currency, direction)
                     else:
                         logging.info("   📊 Neutral strength - using market price")
                 
@@ -930,38 +1309,47 @@ class LiveTrader:
                             price_adjustment -= spread * 0.1
                         logging.info("   ⚠️ High market uncertainty - conservative entry")
             
-            # Calculate final optimal price
-            optimal_price = base_price + price_adjustment
-            
-            # Apply sanity checks to prevent extreme prices
-            if direction == 'BUY':
-                # Don't pay more than 1.5 spreads above ask
-                max_price = ask + (spread * 1.5)
-                optimal_price = min(optimal_price, max_price)
-                # Don't try to buy below bid (impossible)
-                min_price = bid - (spread * 0.5)
-                optimal_price = max(optimal_price, min_price)
-            else:
-                # Don't sell for less than 1.5 spreads below bid
-                min_price = bid - (spread * 1.5)
-                optimal_price = max(optimal_price, min_price)
-                # Don't try to sell above ask + reasonable buffer
-                max_price = ask + (spread * 0.5)
-                optimal_price = min(optimal_price, max_price)
+            # Calculate final optimal price, bounded to a sane band around the touch
+            optimal_price = bound_entry_price(
+                direction == 'BUY', float(base_price + price_adjustment), float(bid), float(ask), float(spread)
+            )
             
-            logging.info(f"💰 UFO Optimal Entry Price: {optimal_price:.5f}")
-            logging.info(f"   Market: Bid={bid:.5f}, Ask={ask:.5f}, Spread={spread:.5f}")
-            logging.info(f"   Adjustment: {price_adjustment:.5f} ({price_adjustment/spread*100:.1f}% of spread)")
+            logging.info("💰 UFO Optimal Entry Price: %.5f", optimal_price)
+            logging.info("   Market: Bid=%.5f, Ask=%.5f, Spread=%.5f", bid, ask, spread)
+            logging.info("   Adjustment: %.5f (%.1f%% of spread)", price_adjustment, price_adjustment/spread*100)
             
             return optimal_price
             
         except Exception as e:
-            logging.error(f"❌ Error calculating UFO entry price: {e}")
-            import traceback
-            logging.error(traceback.format_exc())
+            logging.exception("❌ Error calculating UFO entry price: %s", e)
             # Return market price as fallback
             return ask if direction == 'BUY' else bid
     
+    def _index_ufo_snapshot(self, ufo_data):
+        """
+        Flatten the latest strength of every currency into a
+        {(timeframe, currency): value} dict, once per UFO snapshot.
+        """
+        index = {}
+        for timeframe, strength_data in ufo_data.get('raw_data', ufo_data).items():
+            if hasattr(strength_data, 'columns'):
+                if strength_data.empty:
+                    continue
+                latest = strength_data.iloc[-1].to_dict()
+            elif isinstance(strength_data, dict):
+                latest = {
+                    currency: values[-1] if isinstance(values, list) else values
+                    for currency, values in strength_data.items()
+                    if not isinstance(values, list) or values
+                }
+            else:
+                continue
+            for currency, value in latest.items():
+                index[(timeframe, currency)] = float(value)
+        
+        self._ufo_strength_index = index
+        self._ufo_indexed_snapshot = ufo_data
+
     def _get_currency_strength_from_ufo(self, currency, ufo_data, timeframe=None):
         """
         Extract currency strength from UFO data.
@@ -979,6 +1367,12 @@ class LiveTrader:
             if timeframe is None:
                 timeframe = mt5.TIMEFRAME_M5
             
+            # Current snapshot: a single hash lookup
+            if ufo_data is self._ufo_indexed_snapshot:
+                value = self._ufo_strength_index.get((timeframe, currency))
+                if value is not None:
+                    return value
+            
             # Extract raw UFO data
             raw_data = ufo_data.get('raw_data', ufo_data)
             
@@ -1019,54 +1413,68 @@ class LiveTrader:
             return
         
         try:
-            positions_df = self.agents['risk_manager'].portfolio_manager.get_positions()
+            positions_df = self._get_positions_df()
             if positions_df is None or positions_df.empty:
                 return
             
+            # Nothing this pass finds could execute once the minute's budget is spent
+            now = time.monotonic()
+            budget = self._reinforcement_budget
+            if now - budget[0] >= 60.0:
+                budget[0], budget[1] = now, 0
+            remaining = self.max_reinforcements_per_cycle - budget[1]
+            if remaining <= 0:
+                return
+            
+            # One conversion to plain dicts; the engines only need .get() access
+            positions = positions_df.to_dict('records')
+            current_ufo_data = getattr(self, 'last_ufo_data', None)
+            
+            # Without a UFO snapshot only dynamic events remain, and those need a position
+            # below its reinforcement cap; skip the market data fetch when none is
+            if not current_ufo_data and not self.dynamic_reinforcement_engine.can_reinforce_any(positions):
+                return
+            
             logging.info("🔍 Analyzing positions for reinforcement opportunities...")
             
             # Get comprehensive market data
-            current_market_data = self.get_real_time_market_data_for_positions(positions_df)
-            current_ufo_data = getattr(self, 'last_ufo_data', None)
+            current_market_data, market_arrays = self.get_market_data_with_arrays(positions_df)
             
             reinforcement_opportunities = []
             
-            for _, position in positions_df.iterrows():
-                # Check UFO-based reinforcement signals
-                if current_ufo_data:
-                    should_reinforce, reason, reinforcement_plan = self.ufo_engine.should_reinforce_position(
-                        position, current_ufo_data, current_market_data
-                    )
-                    
-                    if should_reinforce and reinforcement_plan:
-                        reinforcement_opportunities.append({
-                            'position': position,
-                            'plan': reinforcement_plan,
-                            'reason': reason,
-                            'type': 'UFO-based'
-                        })
-                
-                # Check dynamic reinforcement signals
-                market_events = self.dynamic_reinforcement_engine.detect_market_events(
-                    [position], current_market_data, current_ufo_data
+            # Check UFO-based reinforcement signals across all positions at once
+            if current_ufo_data:
+                for idx, reason, reinforcement_plan in self.ufo_engine.should_reinforce_positions(
+                    positions, current_ufo_data, current_market_data
+                ):
+                    reinforcement_opportunities.append({
+                        'position': positions[idx],
+                        'plan': reinforcement_plan,
+                        'reason': reason,
+                        'type': 'UFO-based'
+                    })
+            
+            # Check dynamic reinforcement signals across all positions at once, reading
+            # prices from the array view built alongside current_market_data
+            for idx, event in self.dynamic_reinforcement_engine.detect_market_events_batch(
+                positions, current_market_data, current_ufo_data, market_arrays=market_arrays
+            ):
+                position = positions[idx]
+                plan = self.dynamic_reinforcement_engine.calculate_dynamic_reinforcement(
+                    position, event, current_market_data, current_ufo_data
                 )
                 
-                for event in market_events:
-                    plan = self.dynamic_reinforcement_engine.calculate_dynamic_reinforcement(
-                        position, event, current_market_data, current_ufo_data
-                    )
-                    
-                    if plan and plan.get('execute', False):
-                        reinforcement_opportunities.append({
-                            'position': position,
-                            'plan': plan,
-                            'reason': event.get('description', 'Market event'),
-                            'type': 'Dynamic'
-                        })
+                if plan and plan.get('execute', False):
+                    reinforcement_opportunities.append({
+                        'position': position,
+                        'plan': plan,
+                        'reason': event.get('description', 'Market event'),
+                        'type': 'Dynamic'
+                    })
             
             # Execute the most critical reinforcements
             if reinforcement_opportunities:
-                logging.info(f"📊 Found {len(reinforcement_opportunities)} reinforcement opportunities")
+                logging.info("📊 Found %s reinforcement opportunities", len(reinforcement_opportunities))
                 
                 # Sort by priority (if specified in plan)
                 reinforcement_opportunities.sort(
@@ -1075,13 +1483,11 @@ class LiveTrader:
                 )
                 
                 # Execute top opportunities (limit to prevent over-leveraging)
-                max_reinforcements_per_cycle = 3
                 executed_count = 0
                 
-                for opportunity in reinforcement_opportunities[:max_reinforcements_per_cycle]:
-                    logging.info(f"\n🎯 Executing {opportunity['type']} reinforcement:")
-                    logging.info(f"   Position: {opportunity['position'].symbol} #{opportunity['position'].ticket}")
-                    logging.info(f"   Reason: {opportunity['reason']}")
+                for opportunity in reinforcement_opportunities[:remaining]:
+                    logging.info(_REINFORCEMENT_FMT, opportunity['type'], opportunity['position']['symbol'],
+                                 opportunity['position']['ticket'], opportunity['reason'])
                     
                     if opportunity['type'] == 'UFO-based':
                         success, result_msg = self.ufo_engine.execute_compensation_trade(
@@ -1090,28 +1496,36 @@ class LiveTrader:
                             self.trade_executor
                         )
                         if success:
-                            logging.info(f"✅ {result_msg}")
+                            logging.info("✅ %s", result_msg)
                             executed_count += 1
                         else:
-                            logging.error(f"❌ {result_msg}")
+                            logging.error("❌ %s", result_msg)
                     else:
                         # Dynamic reinforcement
                         event = {'type': opportunity['type'], 'description': opportunity['reason']}
                         if self.execute_dynamic_reinforcement(
                             opportunity['position'],
                             opportunity['plan'],
-                            event
+                            event,
+                            market_data=current_market_data
                         ):
                             executed_count += 1
                 
-                logging.info(f"\n📈 Reinforcement summary: {executed_count}/{len(reinforcement_opportunities)} executed")
+                budget[1] += executed_count
+                logging.info("\n📈 Reinforcement summary: %s/%s executed", executed_count, len(reinforcement_opportunities))
             else:
                 logging.info("✔️ No reinforcement opportunities at this time")
                 
         except Exception as e:
-            logging.error(f"❌ Error in reinforcement analysis: {e}")
-            import traceback
-            logging.error(traceback.format_exc())
+            logging.exception("❌ Error in reinforcement analysis: %s", e)
+
+    def get_market_data_with_arrays(self, open_positions):
+        """
+        get_real_time_market_data_for_positions plus the structure-of-arrays view
+        (see _market_arrays) built from that same dict, for batch consumers.
+        """
+        market_data = self.get_real_time_market_data_for_positions(open_positions)
+        return market_data, _market_arrays(market_data)
 
     def get_real_time_market_data_for_positions(self, open_positions, use_cache=True):
         """
@@ -1138,94 +1552,61 @@ class LiveTrader:
         else:
             return current_market_data
         
-        # Cache management for high-frequency calls
-        current_time = pd.Timestamp.now()
-        cache_key = f"market_data_{current_time.floor('1S')}"  # Cache per second
+        # Extract unique symbols from positions (handle both DataFrame and list)
+        symbols_to_fetch = set()
         
+        if hasattr(open_positions, 'columns'):
+            # DataFrame format: de-duplicate in pandas' hash table, not a Python loop
+            symbols_to_fetch.update(open_positions['symbol'].unique().tolist())
+        elif hasattr(open_positions, '__iter__'):
+            # List/iterable format
+            for position in open_positions:
+                if isinstance(position, dict):
+                    symbols_to_fetch.add(position['symbol'])
+                elif hasattr(position, 'symbol'):
+                    symbols_to_fetch.add(position.symbol)
+        else:
+            # Single position
+            if hasattr(open_positions, 'symbol'):
+                symbols_to_fetch.add(open_positions.symbol)
+        
+        # Calls within one monitoring tick (cycle compensation loop, reinforcement checks,
+        # a rapid-change wake-up) share one snapshot while it covers the requested symbols
+        now = time.monotonic()
         if use_cache:
-            # Initialize cache if needed
-            if not hasattr(self, '_market_data_cache'):
-                self._market_data_cache = {}
-                self._cache_timestamps = {}
-            
-            # Return cached data if fresh (less than 1 second old)
-            if cache_key in self._market_data_cache:
-                cache_age = (current_time - self._cache_timestamps[cache_key]).total_seconds()
-                if cache_age < 1.0:  # Use cached data if less than 1 second old
-                    return self._market_data_cache[cache_key]
-            
+            snapshot_at, snapshot_symbols, snapshot = self._market_snapshot
+            if now - snapshot_at < self.market_snapshot_ttl and symbols_to_fetch <= snapshot_symbols:
+                return {symbol: snapshot[symbol] for symbol in symbols_to_fetch if symbol in snapshot}
+        
+        current_time = pd.Timestamp.now()
         try:
-            if not self.mt5_collector.connect():
+            # Reuse the held connection; the keep-alive only pings once per interval
+            if not self._check_mt5_connection():
                 logging.warning("⚠️ Failed to connect to MT5 for market data collection")
                 return current_market_data
             
-            # Extract unique symbols from positions (handle both DataFrame and list)
-            symbols_to_fetch = set()
-            
-            if hasattr(open_positions, 'iterrows'):
-                # DataFrame format
-                for _, position in open_positions.iterrows():
-                    symbols_to_fetch.add(position['symbol'])
-            elif hasattr(open_positions, '__iter__'):
-                # List/iterable format
-                for position in open_positions:
-                    if isinstance(position, dict):
-                        symbols_to_fetch.add(position['symbol'])
-                    elif hasattr(position, 'symbol'):
-                        symbols_to_fetch.add(position.symbol)
-            else:
-                # Single position
-                if hasattr(open_positions, 'symbol'):
-                    symbols_to_fetch.add(open_positions.symbol)
+            # Fetch all symbols concurrently so the MT5 IPC round-trips overlap;
+            # results are assembled here in the calling thread
+            symbols = list(symbols_to_fetch)
+            futures = [self._io_pool.submit(self._fetch_symbol_market_data, symbol, current_time) for symbol in symbols]
             
-            # Fetch market data for each symbol
             successful_fetches = 0
-            for symbol in symbols_to_fetch:
+            for symbol, future in zip(symbols, futures):
                 try:
-                    # Try to get tick data first (most accurate)
-                    tick = mt5.symbol_info_tick(symbol)
-                    if tick is not None and tick.bid > 0:
-                        current_market_data[symbol] = {
-                            'close': tick.bid,
-                            'ask': tick.ask,
-                            'bid': tick.bid,
-                            'spread': tick.ask - tick.bid,
-                            'last': tick.last if hasattr(tick, 'last') else tick.bid,
-                            'volume': tick.volume if hasattr(tick, 'volume') else 0,
-                            'timestamp': current_time
-                        }
-                        successful_fetches += 1
-                    else:
-                        # Fallback to recent bar data if tick is not available
-                        rates = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M1, 0, 1)
-                        if rates is not None and len(rates) > 0:
-                            close_price = rates[0]['close']
-                            # Estimate spread based on symbol type
-                            if 'JPY' in symbol:
-                                estimated_spread = 0.01  # 1 pip for JPY pairs
-                            else:
-                                estimated_spread = 0.0001  # 1 pip for other pairs
-                            
-                            current_market_data[symbol] = {
-                                'close': close_price,
-                                'ask': close_price + estimated_spread,
-                                'bid': close_price,
-                                'spread': estimated_spread,
-                                'last': close_price,
-                                'volume': rates[0]['tick_volume'] if 'tick_volume' in rates[0] else 0,
-                                'timestamp': current_time
-                            }
-                            successful_fetches += 1
-                        else:
-                            logging.warning(f"⚠️ No market data available for {symbol}")
-                    
+                    entry = future.result()
                 except Exception as e:
-                    logging.error(f"❌ Error getting market data for {symbol}: {e}")
+                    logging.error("❌ Error getting market data for %s: %s", symbol, e)
                     # Try to use last known good data if available
                     if hasattr(self, '_last_known_prices') and symbol in self._last_known_prices:
                         current_market_data[symbol] = self._last_known_prices[symbol]
-                        logging.info(f"📊 Using last known price for {symbol}")
+                        logging.info("📊 Using last known price for %s", symbol)
+                    continue
+                
+                if entry is None:
+                    logging.warning("⚠️ No market data available for %s", symbol)
                     continue
+                current_market_data[symbol] = entry
+                successful_fetches += 1
             
             # Store successful fetches as last known prices
             if not hasattr(self, '_last_known_prices'):
@@ -1234,35 +1615,64 @@ class LiveTrader:
             
             # Log summary
             if successful_fetches > 0:
-                logging.info(f"📊 Market data collected for {successful_fetches}/{len(symbols_to_fetch)} symbols")
+                logging.info("📊 Market data collected for %s/%s symbols", successful_fetches, len(symbols_to_fetch))
             
-            # Update cache
+            # Update the snapshot
             if use_cache and current_market_data:
-                self._market_data_cache[cache_key] = current_market_data
-                self._cache_timestamps[cache_key] = current_time
-                
-                # Clean old cache entries (keep only last 60 seconds of data)
-                cutoff_time = current_time - pd.Timedelta(seconds=60)
-                keys_to_remove = [k for k, t in self._cache_timestamps.items() if t < cutoff_time]
-                for key in keys_to_remove:
-                    del self._market_data_cache[key]
-                    del self._cache_timestamps[key]
-            
-            self.mt5_collector.disconnect()
+                self._market_snapshot = (now, frozenset(symbols_to_fetch), current_market_data)
             
         except Exception as e:
-            logging.error(f"❌ Critical error in market data collection: {e}")
-            import traceback
-            logging.error(traceback.format_exc())
+            # Force a ping (and reconnect if needed) on the next call
+            self._last_mt5_ping = 0.0
+            logging.exception("❌ Critical error in market data collection: %s", e)
             
         return current_market_data
     
+    def _fetch_symbol_market_data(self, symbol, current_time):
+        """
+        Market-data entry for one symbol from its latest tick, falling back to the last
+        M1 bar (with a one-pip spread estimate). Returns None when neither is available.
+        """
+        # Try to get tick data first (most accurate)
+        tick = self._get_symbol_tick(symbol)
+        if (tick is None or tick.bid <= 0) and symbol not in self._selected_symbols:
+            # A symbol missing from Market Watch reports no live tick; select it and retry once
+            if self._ensure_symbol_selected(symbol):
+                tick = self._get_symbol_tick(symbol, max_age=0)
+        if tick is not None and tick.bid > 0:
+            return {
+                'close': tick.bid,
+                'ask': tick.ask,
+                'bid': tick.bid,
+                'spread': tick.ask - tick.bid,
+                'last': tick.last if hasattr(tick, 'last') else tick.bid,
+                'volume': tick.volume if hasattr(tick, 'volume') else 0,
+                'timestamp': current_time
+            }
+        
+        # Fallback to recent bar data if tick is not available
+        rates = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M1, 0, 1)
+        if rates is None or len(rates) == 0:
+            return None
+        close_price = rates[0]['close']
+        # Estimate spread from the symbol's cached default (one pip or one tick)
+        estimated_spread = self._get_symbol_meta(symbol).default_spread
+        return {
+            'close': close_price,
+            'ask': close_price + estimated_spread,
+            'bid': close_price,
+            'spread': estimated_spread,
+            'last': close_price,
+            'volume': rates[0]['tick_volume'] if 'tick_volume' in rates[0] else 0,
+            'timestamp': current_time
+        }
+    
     def check_portfolio_status(self):
         """
         Checks overall portfolio status using UFO methodology.
         """
         try:
-            positions = self.agents['risk_manager'].portfolio_manager.get_positions()
+            positions = self._get_positions_df(refresh=True)
             if positions is None or len(positions) == 0:
                 return
                 
@@ -1271,8 +1681,7 @@ class LiveTrader:
             
             if portfolio_value <= -5.0:  # Portfolio stop loss threshold
                 logging.critical("Portfolio stop loss triggered - closing all positions")
-                for _, position in positions.iterrows():
-                    self.trade_executor.close_trade(position.ticket)
+                self._close_tickets(positions['ticket'].tolist())
                     
         except Exception as e:
             logging.error(f"Error checking portfolio status: {e}")
@@ -0,0 +1,126 @@
+"""
+Helpers for pulling JSON objects out of free-form LLM responses.
+
+All helpers are single linear passes that track string state, so braces, commas
+and '//' inside JSON strings are left alone and there is no regex backtracking on
+large responses.
+"""
+import json
+
+try:
+    import orjson
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catching the
+    # stdlib exception keep working with either parser
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Character classes used by the scanners, built once at import
+_WHITESPACE = frozenset(' \t\r\n')
+_CLOSERS = frozenset('}]')
+
+
+def extract_json_block(text, start=0):
+    """
+    Returns (block, end) for the first balanced {...} object at or after `start`,
+    or (None, -1) if there is none. A brace that never closes is skipped and the
+    scan resumes at the next one when it is a stray '{' in prose; when it opens what
+    looks like a JSON object (first non-blank character '"' or '}') the object was
+    truncated, and the scan stops rather than return one of its inner objects.
+    """
+    begin = text.find('{', start)
+    while begin != -1:
+        depth = 0
+        in_string = False
+        escaped = False
+        for i in range(begin, len(text)):
+            char = text[i]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == '\\':
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == '{':
+                depth += 1
+            elif char == '}':
+                depth -= 1
+                if depth == 0:
+                    return text[begin:i + 1], i + 1
+        # Unbalanced from this brace. A truncated JSON object ends the search; a stray
+        # prose brace does not, since a later brace may still open a complete object
+        j = begin + 1
+        while j < len(text) and text[j] in _WHITESPACE:
+            j += 1
+        if j < len(text) and text[j] in '"}':
+            return None, -1
+        begin = text.find('{', begin + 1)
+    return None, -1
+
+
+def clean_json(json_str):
+    """Removes // line comments and trailing commas (outside strings) in one pass."""
+    out = []
+    in_string = False
+    escaped = False
+    i = 0
+    length = len(json_str)
+    while i < length:
+        char = json_str[i]
+        if in_string:
+            out.append(char)
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+            out.append(char)
+        elif char == '/' and i + 1 < length and json_str[i + 1] == '/':
+            # Skip to end of line, keeping the newline
+            newline = json_str.find('\n', i)
+            i = length if newline == -1 else newline
+            continue
+        elif char in _CLOSERS:
+            # Drop a trailing comma before the closing bracket
+            j = len(out) - 1
+            while j >= 0 and out[j] in _WHITESPACE:
+                j -= 1
+            if j >= 0 and out[j] == ',':
+                del out[j]
+            out.append(char)
+        else:
+            out.append(char)
+        i += 1
+    return ''.join(out)
+
+
+def parse_llm_json(text):
+    """
+    Parses the first JSON object embedded in an LLM response.
+    Returns None when the text contains no '{' at all; raises json.JSONDecodeError
+    when it does but no balanced block parses (including a response truncated
+    mid-object), so callers such as LLMClient can retry.
+    """
+    first_error = None
+    position = 0
+    while True:
+        block, position = extract_json_block(text, position)
+        if block is None:
+            break
+        try:
+            return _loads(clean_json(block))
+        except json.JSONDecodeError as e:
+            if first_error is None:
+                first_error = e
+    if first_error is not None:
+        raise first_error
+    brace = text.find('{')
+    if brace != -1:
+        raise json.JSONDecodeError("Unterminated JSON object", text, brace)
+    return None
@@ -1,7 +1,7 @@
 from openai import OpenAI
 import time
 import json
-import re
+from .json_utils import parse_llm_json
 from openai import APITimeoutError, APIConnectionError, RateLimitError
 
 #deepseek/deepseek-chat-v3-0324:free,deepseek/deepseek-r1-0528,
@@ -100,23 +100,16 @@ class LLMClient:
         try:
             # Only validate if response looks like it contains JSON
             if '{' in response_content and '}' in response_content:
-                # Try to extract and parse JSON from the response
-                json_match = re.search(r'{.*}', response_content, re.DOTALL)
-                if json_match:
-                    json_str = json_match.group(0)
-                    # Clean up common JSON issues
-                    json_str = re.sub(r'//.*?\n', '\n', json_str)  # Remove comments
-                    json_str = re.sub(r',\s*([}\]])', r'\1', json_str)  # Remove trailing commas
-                    
-                    # Try to parse - if it fails, it's not critical for non-JSON responses
-                    try:
-                        json.loads(json_str)
-                    except json.JSONDecodeError:
-                        # For non-JSON responses (like analysis text), this is acceptable
-                        if not any(keyword in response_content.lower() for keyword in ['trades', 'actions', 'currency_pair']):
-                            return  # Skip validation for text-only responses
-                        # Only raise error for responses that should contain valid JSON
-                        raise
+                # Extract, clean up (comments, trailing commas) and parse the JSON block.
+                # If it fails, it's not critical for non-JSON responses
+                try:
+                    parse_llm_json(response_content)
+                except json.JSONDecodeError:
+                    # For non-JSON responses (like analysis text), this is acceptable
+                    if not any(keyword in response_content.lower() for keyword in ['trades', 'actions', 'currency_pair']):
+                        return  # Skip validation for text-only responses
+                    # Only raise error for responses that should contain valid JSON
+                    raise
         except json.JSONDecodeError:
             raise json.JSONDecodeError("Invalid JSON in LLM response", response_content, 0)
     
@@ -101,9 +101,9 @@ class SimulationUFOTradingEngine(UFOTradingEngine):
             
             if not high_impact_events.empty:
                 event_details = []
-                for _, event in high_impact_events.iterrows():
-                    event_time = f"{event['gmt_hour']:02d}:{event['gmt_minute']:02d}"
-                    event_details.append(f"{event_time} GMT: {event['country']} {event['title']}")
+                for event in high_impact_events.itertuples(index=False):
+                    event_time = f"{event.gmt_hour:02d}:{event.gmt_minute:02d}"
+                    event_details.append(f"{event_time} GMT: {event.country} {event.title}")
                 
                 return True, f"High-impact economic events approaching: {'; '.join(event_details)}"
         
@@ -5,6 +5,7 @@ except ImportError:
 
 import datetime
 import pytz
+from concurrent.futures import ThreadPoolExecutor
 from .ufo_trading_engine import UFOTradingEngine
 
 class TradeExecutor:
@@ -123,35 +124,54 @@ class TradeExecutor:
             results.append(result)
         return results
 
-    def close_all_trades(self):
+    def close_all_trades(self, max_workers=8):
         """
-        Closes all open trades.
+        Closes all open trades. Close orders are sent concurrently inside one held
+        MT5 session, so the total latency is about one round-trip instead of one per trade.
         """
-        if not self.mt5_connection.connect():
-            return False
+        with self.mt5_connection.session() as connected:
+            if not connected:
+                return False
 
-        positions = mt5.positions_get()
-        if positions is None:
-            print("No positions found.")
-            return True
+            positions = mt5.positions_get()
+            if positions is None:
+                print("No positions found.")
+                return True
 
-        for position in positions:
-            self.close_trade(position.ticket)
-
-        self.mt5_connection.disconnect()
+            self.close_all([position.ticket for position in positions], max_workers)
         return True
 
+    def close_all(self, tickets, max_workers=8):
+        """
+        Closes the given tickets with concurrent close orders inside one held MT5
+        session and returns {ticket: success}.
+        """
+        tickets = list(tickets)
+        if not tickets:
+            return {}
+        with self.mt5_connection.session() as connected:
+            if not connected:
+                return {ticket: False for ticket in tickets}
+            with ThreadPoolExecutor(max_workers=min(len(tickets), max_workers)) as executor:
+                results = list(executor.map(self._close_position, tickets))
+        return dict(zip(tickets, results))
+
     def close_trade(self, ticket):
         """
         Closes a trade on the MT5 terminal.
         """
         if not self.mt5_connection.connect():
             return False
+        try:
+            return self._close_position(ticket)
+        finally:
+            self.mt5_connection.disconnect()
 
+    def _close_position(self, ticket):
+        """Sends the close order for one ticket on an already open MT5 connection."""
         position_info = mt5.positions_get(ticket=ticket)
         if position_info is None or len(position_info) == 0:
             print(f"No position found with ticket {ticket}")
-            self.mt5_connection.disconnect()
             return False
 
         position = position_info[0]
@@ -173,11 +193,9 @@ class TradeExecutor:
 
         if result.retcode != mt5.TRADE_RETCODE_DONE:
             print(f"Close order failed, retcode={result.retcode}")
-            self.mt5_connection.disconnect()
             return False
 
         print(f"Position {ticket} closed successfully.")
-        self.mt5_connection.disconnect()
         return True
 
     def manage_open_positions(self, market_data, ufo_data):
@@ -1,6 +1,9 @@
 import pandas as pd
 import numpy as np
 from scipy import stats
+from collections import Counter
+
+from ._ufo_jit import oscillation_stats
 
 class UfoCalculator:
     def __init__(self, currencies):
@@ -9,6 +12,9 @@ class UfoCalculator:
         self.oscillation_lookback = 20  # Bars to analyze for oscillations
         self.mean_reversion_threshold = 2.0  # Standard deviations for mean reversion
         self.trend_coherence_threshold = 0.7  # Correlation threshold for trend coherence
+        # Reusable scratch arrays for the fused pipeline, keyed by (timeframe, shape)
+        self._ufo_buffers = {}
+        self.ufo_rolling_window = 20
 
     def calculate_percentage_variation(self, price_data):
         """
@@ -49,6 +55,83 @@ class UfoCalculator:
             ufo_data_dict[timeframe] = ufo_data
         return ufo_data_dict
     
+    def _currency_sign_matrix(self, crosses):
+        """
+        (n_crosses, n_currencies) matrix of +1 where the currency is the base of the
+        cross, -1 where it appears elsewhere in the cross, 0 otherwise.
+        """
+        signs = np.zeros((len(crosses), len(self.currencies)))
+        for i, cross in enumerate(crosses):
+            for j, currency in enumerate(self.currencies):
+                if currency in cross:
+                    signs[i, j] = 1.0 if cross[:3] == currency else -1.0
+        return signs
+
+    def _get_buffer(self, timeframe, shape):
+        """Returns a reusable float64 scratch array for this timeframe and shape."""
+        key = (timeframe, shape)
+        buffer = self._ufo_buffers.get(key)
+        if buffer is None:
+            buffer = np.empty(shape)
+            self._ufo_buffers[key] = buffer
+        return buffer
+
+    def generate_ufo_data_from_prices(self, price_data_dict, executor=None):
+        """
+        Fused equivalent of calculate_percentage_variation -> calculate_incremental_sum
+        -> generate_ufo_data. Each timeframe's close-price matrix is traversed once with
+        NumPy (percentage variation and cumulative sum in a reused scratch buffer, then
+        a single matrix product and an O(n) rolling mean), without intermediate DataFrames.
+        
+        Timeframes are independent, so with an executor they are computed concurrently
+        (each uses its own scratch buffer).
+        """
+        if executor is None or len(price_data_dict) < 2:
+            return {timeframe: self._timeframe_strengths(timeframe, price_data)
+                    for timeframe, price_data in price_data_dict.items()}
+        timeframes = list(price_data_dict)
+        results = executor.map(self._timeframe_strengths, timeframes, price_data_dict.values())
+        return dict(zip(timeframes, results))
+    
+    def _timeframe_strengths(self, timeframe, price_data):
+        """UFO strength frame for one timeframe's close-price matrix (see generate_ufo_data_from_prices)."""
+        window = self.ufo_rolling_window
+        if 'time' in price_data.columns:
+            price_data = price_data.set_index('time')
+        
+        # Forward-fill gaps like pct_change's default padding, on the array itself
+        # (gaps only appear where symbols' bar timestamps don't line up)
+        close = price_data.to_numpy(dtype=np.float64)
+        gaps = np.isnan(close)
+        if gaps.any():
+            last_valid = np.where(gaps, 0, np.arange(close.shape[0])[:, None])
+            np.maximum.accumulate(last_valid, axis=0, out=last_valid)
+            close = close[last_valid, np.arange(close.shape[1])]
+        n_bars = close.shape[0]
+        
+        # Percentage variation, NaN -> 0, then incremental sum in place
+        sums = self._get_buffer(timeframe, close.shape)
+        if n_bars:
+            sums[0] = 0.0
+            np.divide(close[1:], close[:-1], out=sums[1:])
+            sums[1:] -= 1.0
+            sums[1:] *= 100.0
+            np.nan_to_num(sums, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+            np.cumsum(sums, axis=0, out=sums)
+        
+        # Currency performance: signed sum of the crosses it belongs to
+        performance = sums @ self._currency_sign_matrix(list(price_data.columns))
+        
+        # Rolling mean over the window; the first window-1 bars are 0 (as fillna(0))
+        strengths = np.zeros_like(performance)
+        if n_bars >= window:
+            running = np.cumsum(performance, axis=0)
+            strengths[window - 1] = running[window - 1]
+            strengths[window:] = running[window:] - running[:-window]
+            strengths[window - 1:] /= window
+        
+        return pd.DataFrame(strengths, index=price_data.index, columns=self.currencies)
+    
     def detect_oscillations(self, ufo_data_dict):
         """
         Detects short-term oscillations across multiple timeframes for mean reversion opportunities.
@@ -59,66 +142,84 @@ class UfoCalculator:
         for timeframe, ufo_data in ufo_data_dict.items():
             if len(ufo_data) < self.oscillation_lookback:
                 continue
-                
-            tf_oscillations = {}
+            oscillation_analysis[timeframe], _ = self._timeframe_oscillations(ufo_data)
+        
+        return oscillation_analysis
+    
+    def _timeframe_oscillations(self, ufo_data):
+        """
+        Oscillation metrics for one timeframe's strength frame (at least oscillation_lookback
+        bars). Returns ({currency: metrics}, {currency: latest strength}).
+        """
+        tf_oscillations = {}
+        currencies = [currency for currency in self.currencies if currency in ufo_data.columns]
+        if not currencies:
+            return tf_oscillations, {}
+        
+        # Volatility, mean, last value, reversals and the 3-bar trend test for every
+        # currency in one compiled pass over the lookback window
+        volatilities, means, currents, reversal_counts, trending_flags = oscillation_stats(
+            ufo_data, currencies, self.oscillation_lookback
+        )
+        
+        for i, currency in enumerate(currencies):
+            volatility = float(volatilities[i])
+            mean_value = float(means[i])
+            current_value = float(currents[i])
+            reversals = int(reversal_counts[i])
+            is_trending = bool(trending_flags[i])
             
-            for currency in self.currencies:
-                if currency not in ufo_data.columns:
-                    continue
-                    
-                currency_data = ufo_data[currency].iloc[-self.oscillation_lookback:]
-                
-                # Calculate oscillation metrics
-                volatility = currency_data.std()
-                mean_value = currency_data.mean()
-                current_value = currency_data.iloc[-1]
-                
-                # Detect mean reversion conditions
-                z_score = (current_value - mean_value) / volatility if volatility > 0 else 0
-                
-                # Check for oscillation pattern (multiple reversals)
-                reversals = self._count_direction_changes(currency_data)
-                
-                # Determine market state
-                is_trending = all(currency_data.iloc[-3:] > mean_value) or all(currency_data.iloc[-3:] < mean_value)
-
-                if is_trending and abs(z_score) > 1.5:
-                    market_state = 'trending'
-                elif abs(z_score) > self.mean_reversion_threshold:
-                    market_state = 'mean_reversion_opportunity'
-                elif reversals >= 3 and volatility > 0.5:
-                    market_state = 'oscillating'
-                else:
-                    market_state = 'uncertain'
-                
-                tf_oscillations[currency] = {
-                    'z_score': z_score,
-                    'volatility': volatility,
-                    'reversals': reversals,
-                    'market_state': market_state,
-                    'mean_reversion_signal': abs(z_score) > self.mean_reversion_threshold,
-                    'direction_bias': 'bullish' if current_value > mean_value else 'bearish'
-                }
+            # Detect mean reversion conditions
+            z_score = (current_value - mean_value) / volatility if volatility > 0 else 0
             
-            oscillation_analysis[timeframe] = tf_oscillations
+            if is_trending and abs(z_score) > 1.5:
+                market_state = 'trending'
+            elif abs(z_score) > self.mean_reversion_threshold:
+                market_state = 'mean_reversion_opportunity'
+            elif reversals >= 3 and volatility > 0.5:
+                market_state = 'oscillating'
+            else:
+                market_state = 'uncertain'
+            
+            tf_oscillations[currency] = {
+                'z_score': z_score,
+                'volatility': volatility,
+                'reversals': reversals,
+                'market_state': market_state,
+                'mean_reversion_signal': abs(z_score) > self.mean_reversion_threshold,
+                'direction_bias': 'bullish' if current_value > mean_value else 'bearish'
+            }
         
-        return oscillation_analysis
+        return tf_oscillations, dict(zip(currencies, currents.tolist()))
     
-    def _count_direction_changes(self, data_series):
+    def analyze(self, ufo_data_dict):
         """
-        Counts the number of direction changes in a data series to detect oscillations.
+        Fused equivalent of detect_oscillations -> analyze_market_uncertainty ->
+        detect_timeframe_coherence. Each timeframe is visited once: the oscillation kernel's
+        latest values feed the coherence analysis, and the uncertainty metrics are derived
+        from the oscillation results as they are produced.
+        Returns (oscillation_analysis, uncertainty_metrics, coherence_analysis).
         """
-        if len(data_series) < 3:
-            return 0
+        oscillation_analysis = {}
+        uncertainty_metrics = {}
+        latest_strengths = {}
+        
+        for timeframe, ufo_data in ufo_data_dict.items():
+            if len(ufo_data) == 0:
+                continue
+            if len(ufo_data) < self.oscillation_lookback:
+                latest_strengths[timeframe] = ufo_data.iloc[-1]
+                continue
             
-        changes = data_series.diff().dropna()
-        direction_changes = 0
+            tf_oscillations, latest = self._timeframe_oscillations(ufo_data)
+            oscillation_analysis[timeframe] = tf_oscillations
+            latest_strengths[timeframe] = latest
+            metrics = self._timeframe_uncertainty(tf_oscillations)
+            if metrics is not None:
+                uncertainty_metrics[timeframe] = metrics
         
-        for i in range(1, len(changes)):
-            if (changes.iloc[i-1] > 0 and changes.iloc[i] < 0) or (changes.iloc[i-1] < 0 and changes.iloc[i] > 0):
-                direction_changes += 1
-                
-        return direction_changes
+        coherence_analysis = self._coherence_from_latest(latest_strengths) if len(ufo_data_dict) >= 2 else {}
+        return oscillation_analysis, uncertainty_metrics, coherence_analysis
     
     def analyze_market_uncertainty(self, ufo_data_dict, oscillation_analysis):
         """
@@ -130,49 +231,47 @@ class UfoCalculator:
         for timeframe in ufo_data_dict.keys():
             if timeframe not in oscillation_analysis:
                 continue
-                
-            tf_oscillations = oscillation_analysis[timeframe]
-            
-            # Calculate overall uncertainty metrics
-            uncertain_currencies = sum(1 for curr_data in tf_oscillations.values() 
-                                     if curr_data['market_state'] == 'uncertain')
-            oscillating_currencies = sum(1 for curr_data in tf_oscillations.values() 
-                                       if curr_data['market_state'] == 'oscillating')
-            trending_currencies = sum(1 for curr_data in tf_oscillations.values() 
-                                    if curr_data['market_state'] == 'trending')
-            
-            total_currencies = len(tf_oscillations)
-            
-            if total_currencies > 0:
-                uncertainty_ratio = uncertain_currencies / total_currencies
-                oscillation_ratio = oscillating_currencies / total_currencies
-                trend_ratio = trending_currencies / total_currencies
-                
-                # Overall market state determination
-                if trend_ratio > 0.6:
-                    overall_state = 'trending_market'
-                    confidence_level = 'high'
-                elif oscillation_ratio > 0.5:
-                    overall_state = 'ranging_market'
-                    confidence_level = 'medium'
-                elif uncertainty_ratio > 0.4:
-                    overall_state = 'uncertain_market'
-                    confidence_level = 'low'
-                else:
-                    overall_state = 'mixed_market'
-                    confidence_level = 'medium'
-                
-                uncertainty_metrics[timeframe] = {
-                    'uncertainty_ratio': uncertainty_ratio,
-                    'oscillation_ratio': oscillation_ratio,
-                    'trend_ratio': trend_ratio,
-                    'overall_state': overall_state,
-                    'confidence_level': confidence_level,
-                    'recommended_position_scaling': self._get_position_scaling(confidence_level)
-                }
+            metrics = self._timeframe_uncertainty(oscillation_analysis[timeframe])
+            if metrics is not None:
+                uncertainty_metrics[timeframe] = metrics
         
         return uncertainty_metrics
     
+    def _timeframe_uncertainty(self, tf_oscillations):
+        """Uncertainty metrics for one timeframe's oscillation results (None if empty)."""
+        total_currencies = len(tf_oscillations)
+        if total_currencies == 0:
+            return None
+        
+        # Calculate overall uncertainty metrics (all state counts from one pass)
+        state_counts = Counter(curr_data['market_state'] for curr_data in tf_oscillations.values())
+        uncertainty_ratio = state_counts['uncertain'] / total_currencies
+        oscillation_ratio = state_counts['oscillating'] / total_currencies
+        trend_ratio = state_counts['trending'] / total_currencies
+        
+        # Overall market state determination
+        if trend_ratio > 0.6:
+            overall_state = 'trending_market'
+            confidence_level = 'high'
+        elif oscillation_ratio > 0.5:
+            overall_state = 'ranging_market'
+            confidence_level = 'medium'
+        elif uncertainty_ratio > 0.4:
+            overall_state = 'uncertain_market'
+            confidence_level = 'low'
+        else:
+            overall_state = 'mixed_market'
+            confidence_level = 'medium'
+        
+        return {
+            'uncertainty_ratio': uncertainty_ratio,
+            'oscillation_ratio': oscillation_ratio,
+            'trend_ratio': trend_ratio,
+            'overall_state': overall_state,
+            'confidence_level': confidence_level,
+            'recommended_position_scaling': self._get_position_scaling(confidence_level)
+        }
+    
     def _get_position_scaling(self, confidence_level):
         """
         Returns position scaling factor based on market confidence level.
@@ -192,28 +291,37 @@ class UfoCalculator:
         """
         if len(ufo_data_dict) < 2:
             return {}
-            
+        
+        # Latest strength row per timeframe, read once instead of once per currency
+        latest_strengths = {
+            timeframe: ufo_data.iloc[-1] for timeframe, ufo_data in ufo_data_dict.items() if len(ufo_data) > 0
+        }
+        return self._coherence_from_latest(latest_strengths)
+    
+    def _coherence_from_latest(self, latest_strengths):
+        """
+        Coherence analysis from {timeframe: latest strengths} (a Series or a
+        {currency: strength} dict per timeframe, in timeframe order).
+        """
         coherence_analysis = {}
-        timeframes = list(ufo_data_dict.keys())
         
         for currency in self.currencies:
             currency_coherence = {}
             
             # Get strength values across all timeframes
-            tf_strengths = {}
-            for tf in timeframes:
-                if currency in ufo_data_dict[tf].columns and len(ufo_data_dict[tf]) > 0:
-                    tf_strengths[tf] = ufo_data_dict[tf][currency].iloc[-1]
+            tf_strengths = {
+                tf: latest[currency] for tf, latest in latest_strengths.items() if currency in latest
+            }
             
             if len(tf_strengths) < 2:
                 continue
                 
-            # Calculate coherence metrics
-            strengths = list(tf_strengths.values())
+            # Calculate coherence metrics on one array shared by every metric below
+            strengths = np.fromiter(tf_strengths.values(), dtype=np.float64, count=len(tf_strengths))
             
             # Direction coherence (all positive or all negative)
-            positive_count = sum(1 for s in strengths if s > 0)
-            negative_count = sum(1 for s in strengths if s < 0)
+            positive_count = int(np.count_nonzero(strengths > 0))
+            negative_count = int(np.count_nonzero(strengths < 0))
             total_count = len(strengths)
             
             direction_coherence = max(positive_count, negative_count) / total_count
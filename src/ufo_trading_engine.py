@@ -6,6 +6,7 @@ try:
     import MetaTrader5 as mt5
 except ImportError:
     from . import mock_metatrader5 as mt5
+from ._ufo_jit import detect_strength_changes
 
 class UFOTradingEngine:
     """
@@ -68,8 +69,7 @@ class UFOTradingEngine:
         Determines if trading should occur based on session timing
         Avoids major news and focuses on session-based opportunities
         """
-        now_utc = datetime.utcnow().replace(tzinfo=pytz.UTC)
-        london_time = now_utc.astimezone(self.session_timezone)
+        london_time = datetime.now(self.session_timezone)
         current_time = london_time.time()
         current_weekday = london_time.weekday()  # 0=Monday, 6=Sunday
         
@@ -103,7 +103,7 @@ class UFOTradingEngine:
         Determines if positions should be closed due to session ending
         Uses simulation time and actual economic calendar data instead of hardcoded news times
         """
-        now_utc = datetime.utcnow().replace(tzinfo=pytz.UTC)
+        now_utc = datetime.now(pytz.UTC)
         london_time = now_utc.astimezone(self.session_timezone)
         current_time_london = london_time.time()
         current_weekday = london_time.weekday()
@@ -138,9 +138,9 @@ class UFOTradingEngine:
 
             if not high_impact_events.empty:
                 event_details = []
-                for _, event in high_impact_events.iterrows():
-                    event_time = f"{event['gmt_hour']:02d}:{event['gmt_minute']:02d}"
-                    event_details.append(f"{event_time} GMT: {event['country']} {event['title']}")
+                for event in high_impact_events.itertuples(index=False):
+                    event_time = f"{event.gmt_hour:02d}:{event.gmt_minute:02d}"
+                    event_details.append(f"{event_time} GMT: {event.country} {event.title}")
 
                 return True, f"High-impact economic events approaching: {'; '.join(event_details)}"
 
@@ -165,25 +165,16 @@ class UFOTradingEngine:
             current_strengths = current_ufo_data[timeframe]
             previous_strengths = previous_ufo_data[timeframe]
             
-            # Detect significant strength changes
-            for currency in current_strengths.columns:
-                if currency not in previous_strengths.columns:
-                    continue
-                    
-                current_strength = current_strengths[currency].iloc[-1]
-                previous_strength = previous_strengths[currency].iloc[-5:]  # Last 5 bars average
-                avg_previous = previous_strength.mean()
-                
-                # Signal strength reversal (threshold can be tuned)
-                if abs(current_strength - avg_previous) > 2.0:  # Significant change
-                    direction_change = "strengthening" if current_strength > avg_previous else "weakening"
-                    exit_signals.append({
-                        'currency': currency,
-                        'timeframe': timeframe,
-                        'change': current_strength - avg_previous,
-                        'direction': direction_change,
-                        'reason': f"{currency} {direction_change} on {timeframe}"
-                    })
+            # Detect significant strength changes vs. the last 5 bars average (threshold can be tuned)
+            for currency, change in detect_strength_changes(current_strengths, previous_strengths, threshold=2.0):
+                direction_change = "strengthening" if change > 0 else "weakening"
+                exit_signals.append({
+                    'currency': currency,
+                    'timeframe': timeframe,
+                    'change': change,
+                    'direction': direction_change,
+                    'reason': f"{currency} {direction_change} on {timeframe}"
+                })
         
         return exit_signals
     
@@ -381,6 +372,23 @@ class UFOTradingEngine:
         else:
             return False, f"Hold position: analysis valid, no reinforcement needed", {}
     
+    def should_reinforce_positions(self, positions, current_analysis, current_market_data):
+        """
+        should_reinforce_position over a whole list of positions in one call.
+        Returns (position_index, reason, plan) for each position with a reinforcement plan.
+        """
+        if current_analysis is None:
+            return []
+        
+        opportunities = []
+        for idx, position in enumerate(positions):
+            should_reinforce, reason, plan = self.should_reinforce_position(
+                position, current_analysis, current_market_data
+            )
+            if should_reinforce and plan:
+                opportunities.append((idx, reason, plan))
+        return opportunities
+    
     def execute_compensation_trade(self, original_position, reinforcement_plan, trade_executor):
         """
         Executes the compensation trade to recover from timing errors
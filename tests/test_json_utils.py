@@ -0,0 +1,32 @@
+import json
+
+import pytest
+
+from src.llm.json_utils import extract_json_block, parse_llm_json
+
+
+def test_extract_skips_unbalanced_brace_in_prose():
+    text = 'Risk note: keep exposure {low.\nDecision: {"trades": []}'
+    block, end = extract_json_block(text)
+    assert block == '{"trades": []}'
+    assert end == len(text)
+
+
+def test_parse_finds_decision_after_stray_brace():
+    text = 'Risk note: keep exposure {low.\nDecision: {"trades": [{"currency_pair": "EURUSD"}]}'
+    assert parse_llm_json(text) == {"trades": [{"currency_pair": "EURUSD"}]}
+
+
+def test_parse_ignores_braces_inside_strings_and_trailing_commas():
+    text = 'Plan:\n{"note": "a } b {", "trades": [1, 2,], // comment\n}'
+    assert parse_llm_json(text) == {"note": "a } b {", "trades": [1, 2]}
+
+
+def test_parse_raises_on_truncated_response():
+    text = '{"trades": [{"currency_pair": "EURUSD", "direction": "BUY"}, {"currency_pair": "GBP'
+    with pytest.raises(json.JSONDecodeError):
+        parse_llm_json(text)
+
+
+def test_parse_returns_none_without_braces():
+    assert parse_llm_json("No trades this cycle.") is None